@@ -0,0 +1,88 @@
+from itertools import compress
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+AGGREGATES = ("count", "sum", "min", "max", "mean")
+
+
+def _check(aggs: Sequence[str]) -> None:
+    bad = [a for a in aggs if a not in AGGREGATES]
+    if bad:
+        raise ValueError(f"unknown aggregates {bad}; expected some of {AGGREGATES}")
+
+
+def group_reduce_python(codes: Sequence[int], values: Sequence[int], n_groups: int,
+                        alive: Optional[Sequence[int]] = None) -> List[List[Any]]:
+    # alive (one 0/1 byte per row) skips tombstoned rows without compacting.
+    rows = zip(codes, values) if alive is None else compress(zip(codes, values), alive)
+    count = [0] * n_groups
+    total = [0] * n_groups
+    lo: List[Any] = [None] * n_groups
+    hi: List[Any] = [None] * n_groups
+    for c, v in rows:
+        if count[c]:
+            if v < lo[c]: lo[c] = v
+            elif v > hi[c]: hi[c] = v
+        else:
+            lo[c] = hi[c] = v
+        count[c] += 1
+        total[c] += v
+    return [count, total, lo, hi]
+
+
+def group_reduce_numpy(codes: Any, values: Any, n_groups: int, alive: Any = None) -> List[List[Any]]:
+    # codes/values may be any buffer (array('i') / array('q')); they are wrapped,
+    # not copied. Unbuffered ufunc.at keeps int64 sums exact and, unlike
+    # reduceat, needs no argsort of the codes first. Dead rows (alive == 0)
+    # land in a spare group n_groups that is dropped from the result.
+    c = codes if isinstance(codes, np.ndarray) else np.frombuffer(codes, dtype=np.int32)
+    v = values if isinstance(values, np.ndarray) else np.frombuffer(values, dtype=np.int64)
+    size = n_groups
+    if alive is not None:
+        live = alive if isinstance(alive, np.ndarray) else np.frombuffer(alive, dtype=np.uint8)
+        c = np.where(live.astype(bool), c, n_groups)
+        size += 1
+    count = np.bincount(c, minlength=size)[:n_groups]
+    total = np.zeros(size, dtype=np.int64)
+    np.add.at(total, c, v)
+    lo = np.full(size, np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(lo, c, v)
+    hi = np.full(size, np.iinfo(np.int64).min, dtype=np.int64)
+    np.maximum.at(hi, c, v)
+    total, lo, hi = total[:n_groups], lo[:n_groups], hi[:n_groups]
+    present = count > 0
+    return [count.tolist(), total.tolist(),
+            [x if p else None for x, p in zip(lo.tolist(), present)],
+            [x if p else None for x, p in zip(hi.tolist(), present)]]
+
+
+def group_reduce(codes: Any, values: Any, n_groups: int, use_numpy: bool = True,
+                 alive: Any = None) -> List[List[Any]]:
+    if np is not None and use_numpy:
+        return group_reduce_numpy(codes, values, n_groups, alive)
+    return group_reduce_python(codes, values, n_groups, alive)
+
+
+class GroupBy:
+    def __init__(self, names: Sequence[str], codes: Any, values: Any, alive: Any = None):
+        self.names = list(names)
+        self.codes = codes
+        self.values = values
+        self.alive = alive
+
+    def agg(self, *aggs: str, use_numpy: bool = True) -> Dict[str, Dict[str, Any]]:
+        aggs = aggs or AGGREGATES
+        _check(aggs)
+        count, total, lo, hi = group_reduce(self.codes, self.values, len(self.names), use_numpy, self.alive)
+        out: Dict[str, Dict[str, Any]] = {}
+        for g, name in enumerate(self.names):
+            if not count[g]:
+                continue
+            cols = {"count": count[g], "sum": total[g], "min": lo[g], "max": hi[g],
+                    "mean": total[g] / count[g]}
+            out[name] = {a: cols[a] for a in aggs}
+        return out
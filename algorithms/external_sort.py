@@ -0,0 +1,158 @@
+import heapq
+import os
+import shutil
+import struct
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from models import Record
+
+# Run files hold back-to-back records: id, value, category and text lengths,
+# then the UTF-8 bytes of both strings.
+_REC = struct.Struct("<qqII")
+_BLOCK = 1 << 20
+# Rough in-memory cost of one buffered Record (object, dict, ints, strings,
+# key tuple) beyond its string payload; used to stay within memory_limit.
+_RECORD_OVERHEAD = 400
+
+_COLUMNS = ("id", "category", "value", "text")
+
+
+def record_key(*columns: str) -> Callable[[Record], tuple]:
+    # record_key("category", "-value", "id") sorts by category, then value
+    # descending, then id. A leading "-" is only allowed on numeric columns.
+    getters = []
+    for col in columns:
+        desc = col.startswith("-")
+        name = col[1:] if desc else col
+        if name not in _COLUMNS:
+            raise ValueError(f"unknown column {name!r}; expected one of {_COLUMNS}")
+        if desc and name not in ("id", "value"):
+            raise ValueError(f"descending order is only supported on numeric columns, not {name!r}")
+        getters.append((name, desc))
+
+    def key(r: Record) -> tuple:
+        return tuple(-getattr(r, name) if desc else getattr(r, name) for name, desc in getters)
+    return key
+
+
+def _write_run(path: str, records: Iterable[Record]) -> int:
+    pack = _REC.pack
+    with open(path, "wb", buffering=_BLOCK) as f:
+        for r in records:
+            cat = r.category.encode("utf-8")
+            text = r.text.encode("utf-8")
+            f.write(pack(r.id, r.value, len(cat), len(text)))
+            f.write(cat)
+            f.write(text)
+        return f.tell()
+
+
+def _read_run(path: str, block_size: int = _BLOCK) -> Iterator[Record]:
+    # Reads whole blocks and decodes from memory; a record cut by the block
+    # boundary is carried over to the next block.
+    unpack_from = _REC.unpack_from
+    head = _REC.size
+    with open(path, "rb", buffering=0) as f:
+        buf = b""
+        while True:
+            block = f.read(block_size)
+            if not block:
+                if buf:
+                    raise ValueError(f"{path}: truncated run file")
+                return
+            buf = buf + block if buf else block
+            pos, end = 0, len(buf)
+            while pos + head <= end:
+                rid, value, cat_len, text_len = unpack_from(buf, pos)
+                body = pos + head
+                stop = body + cat_len + text_len
+                if stop > end:
+                    break
+                yield Record(rid, buf[body:body + cat_len].decode("utf-8"), value,
+                             buf[body + cat_len:stop].decode("utf-8"))
+                pos = stop
+            buf = buf[pos:]
+
+
+class ExternalSorter:
+    # Sorts a Record stream larger than memory: buffer records until
+    # memory_limit bytes (estimated), sort the buffer stably, spill it as a
+    # binary run, then heap-merge at most fan_in runs at a time. Runs are
+    # merged in creation order and heapq.merge breaks ties by input position,
+    # so equal keys keep their original order.
+    def __init__(self, key: Callable[[Record], Any] = None, memory_limit: int = 64 << 20,
+                 fan_in: int = 64, tmp_dir: Optional[str] = None):
+        if fan_in < 2:
+            raise ValueError("fan_in must be >= 2")
+        self.key = key or record_key("id")
+        self.memory_limit = memory_limit
+        self.fan_in = fan_in
+        self.tmp_dir = tmp_dir
+        # Read buffers for a merge of fan_in runs share the memory budget.
+        self.block_size = min(_BLOCK, max(1 << 16, memory_limit // (fan_in + 1)))
+        self.stats: Dict[str, Any] = {}
+
+    def sort(self, records: Iterable[Record]) -> Iterator[Record]:
+        t0 = time.perf_counter()
+        work = tempfile.mkdtemp(prefix="extsort-", dir=self.tmp_dir)
+        stats = self.stats = {"records": 0, "runs": 0, "merge_passes": 0, "bytes_spilled": 0}
+        try:
+            runs, rest = self._make_runs(records, work, stats)
+            if not runs:
+                yield from rest
+                return
+            while len(runs) > self.fan_in:
+                stats["merge_passes"] += 1
+                runs = [self._merge_to_file(runs[i:i + self.fan_in], work, stats)
+                        for i in range(0, len(runs), self.fan_in)]
+            stats["merge_passes"] += 1
+            yield from heapq.merge(*(_read_run(p, self.block_size) for p in runs), key=self.key)
+        finally:
+            shutil.rmtree(work, ignore_errors=True)
+            stats["seconds"] = time.perf_counter() - t0
+
+    def _make_runs(self, records: Iterable[Record], work: str,
+                   stats: Dict[str, Any]) -> Tuple[List[str], List[Record]]:
+        # Returns (run paths, []), or ([], sorted records) when the whole input
+        # fit in one buffer and nothing had to be spilled.
+        key = self.key
+        buf: List[Record] = []
+        used = 0
+        paths: List[str] = []
+        for r in records:
+            buf.append(r)
+            used += _RECORD_OVERHEAD + len(r.category) + len(r.text)
+            if used >= self.memory_limit:
+                buf.sort(key=key)
+                paths.append(self._spill(buf, work, stats))
+                buf = []
+                used = 0
+            stats["records"] += 1
+        buf.sort(key=key)
+        if not paths:
+            return [], buf
+        if buf:
+            paths.append(self._spill(buf, work, stats))
+        return paths, []
+
+    def _spill(self, records: Iterable[Record], work: str, stats: Dict[str, Any]) -> str:
+        path = os.path.join(work, f"run-{stats['runs']:06d}.bin")
+        stats["runs"] += 1
+        stats["bytes_spilled"] += _write_run(path, records)
+        return path
+
+    def _merge_to_file(self, paths: List[str], work: str, stats: Dict[str, Any]) -> str:
+        if len(paths) == 1:
+            return paths[0]
+        out = self._spill(heapq.merge(*(_read_run(p, self.block_size) for p in paths), key=self.key), work, stats)
+        for p in paths:
+            os.remove(p)
+        return out
+
+
+def external_sort(records: Iterable[Record], key: Callable[[Record], Any] = None,
+                  memory_limit: int = 64 << 20, fan_in: int = 64,
+                  tmp_dir: Optional[str] = None) -> Iterator[Record]:
+    return ExternalSorter(key, memory_limit, fan_in, tmp_dir).sort(records)
@@ -0,0 +1,122 @@
+import multiprocessing
+import os
+from array import array
+from bisect import bisect_left
+from multiprocessing import shared_memory
+from typing import List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_ITEM = 8                 # int64
+_MIN_PARALLEL = 1 << 16   # below this, pool start-up costs more than the sort
+
+
+def _sort_chunk(task: Tuple[str, int, int]) -> None:
+    # Sorts values[lo:hi] of the shared int64 block in place.
+    name, lo, hi = task
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        if np is not None:
+            np.ndarray(hi - lo, dtype=np.int64, buffer=shm.buf, offset=lo * _ITEM).sort()
+            return
+        view = shm.buf.cast("q")
+        seg = view[lo:hi]
+        data = seg.tolist()
+        data.sort()
+        seg[:] = array("q", data)
+        seg.release()
+        view.release()
+    finally:
+        shm.close()
+
+
+def _merge_slices(task: Tuple[str, str, int, List[Tuple[int, int]], int]) -> None:
+    # Merges one key range: the [lo, hi) piece of every sorted chunk, written
+    # to out[offset:offset + total]. The pieces are sorted runs, so Timsort
+    # (or NumPy's stable sort) merges them without re-sorting.
+    src_name, out_name, n, pieces, offset = task
+    src = shared_memory.SharedMemory(name=src_name)
+    out = shared_memory.SharedMemory(name=out_name)
+    try:
+        total = sum(hi - lo for lo, hi in pieces)
+        if np is not None:
+            vals = np.ndarray(n, dtype=np.int64, buffer=src.buf)
+            merged = np.ndarray(total, dtype=np.int64, buffer=out.buf, offset=offset * _ITEM)
+            merged[:] = np.concatenate([vals[lo:hi] for lo, hi in pieces])
+            merged.sort(kind="stable")
+            return
+        src_view = src.buf.cast("q")
+        data: List[int] = []
+        for lo, hi in pieces:
+            data += src_view[lo:hi].tolist()
+        data.sort()
+        out_view = out.buf.cast("q")
+        out_view[offset:offset + total] = array("q", data)
+        out_view.release()
+        src_view.release()
+    finally:
+        src.close()
+        out.close()
+
+
+def _splitters(view: Sequence[int], bounds: List[Tuple[int, int]], parts: int) -> List[int]:
+    # Regular sampling over the sorted chunks (PSRS): `parts` evenly spaced
+    # values per chunk, then every parts-th value of the pooled sample.
+    sample = []
+    for lo, hi in bounds:
+        step = max(1, (hi - lo) // parts)
+        sample.extend(view[i] for i in range(lo, hi, step))
+    sample.sort()
+    step = len(sample) / parts
+    return [sample[int(step * j)] for j in range(1, parts)]
+
+
+def parallel_sort(values: Sequence[int], workers: Optional[int] = None,
+                  min_parallel: int = _MIN_PARALLEL) -> Union[List[int], array]:
+    # Ascending copy of an int sequence using a process pool. The values are
+    # copied once into a shared int64 block; each worker sorts one chunk in
+    # place, then each worker merges one key range of all chunks into a second
+    # shared block at its precomputed offset. Only block names and index
+    # ranges cross the process boundary. Returns an array('q') for array
+    # input and a list otherwise; values must fit in int64.
+    workers = workers or os.cpu_count() or 1
+    n = len(values)
+    as_array = isinstance(values, array)
+    if workers < 2 or n < max(min_parallel, 2 * workers):
+        out = sorted(values)
+        return array("q", out) if as_array else out
+
+    src = shared_memory.SharedMemory(create=True, size=n * _ITEM)
+    dst = shared_memory.SharedMemory(create=True, size=n * _ITEM)
+    view = src.buf.cast("q")
+    try:
+        view[:] = values if as_array and values.typecode == "q" else array("q", values)
+        cuts = [n * k // workers for k in range(workers + 1)]
+        bounds = list(zip(cuts, cuts[1:]))
+        with multiprocessing.Pool(workers) as pool:
+            pool.map(_sort_chunk, [(src.name, lo, hi) for lo, hi in bounds])
+
+            # Cut every chunk at the same splitters; range j of all chunks
+            # then lands at out[offset_j:], right after range j-1.
+            splits = _splitters(view, bounds, workers)
+            edges = [[lo] + [bisect_left(view, s, lo, hi) for s in splits] + [hi] for lo, hi in bounds]
+            tasks = []
+            offset = 0
+            for j in range(workers):
+                pieces = [(e[j], e[j + 1]) for e in edges if e[j] < e[j + 1]]
+                if pieces:
+                    tasks.append((src.name, dst.name, n, pieces, offset))
+                    offset += sum(hi - lo for lo, hi in pieces)
+            pool.map(_merge_slices, tasks)
+
+        result = array("q")
+        result.frombytes(dst.buf[:n * _ITEM])
+        return result if as_array else result.tolist()
+    finally:
+        view.release()
+        for shm in (src, dst):
+            shm.close()
+            shm.unlink()
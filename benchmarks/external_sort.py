@@ -0,0 +1,39 @@
+import random
+import resource
+import sys
+import time
+from typing import Iterator
+
+from algorithms.external_sort import _RECORD_OVERHEAD, ExternalSorter, record_key
+from models import Record
+
+
+def records(n: int, seed: int = 0) -> Iterator[Record]:
+    rnd = random.Random(seed)
+    for i in range(n):
+        yield Record(i, f"c{rnd.randrange(64)}", rnd.randrange(1000), "t" * rnd.randrange(40))
+
+
+def main(n: int = 2_000_000, ratio: int = 10, fan_in: int = 64):
+    # The budget is 1/ratio of the estimated in-memory size of the input.
+    est = n * (_RECORD_OVERHEAD + 3 + 20)
+    sorter = ExternalSorter(record_key("category", "-value", "id"), memory_limit=est // ratio, fan_in=fan_in)
+    key = sorter.key
+    t = time.perf_counter()
+    prev = None
+    count = 0
+    for r in sorter.sort(records(n)):
+        k = key(r)
+        assert prev is None or prev <= k
+        prev = k
+        count += 1
+    dt = time.perf_counter() - t
+    assert count == n
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"n={n:,}  input~{est / 2**20:,.0f} MiB  budget {sorter.memory_limit / 2**20:,.0f} MiB  "
+          f"fan-in {fan_in}: {dt:.1f}s  {n / dt:,.0f} records/s  peak RSS {peak:,.0f} MiB  {sorter.stats}")
+
+
+if __name__ == "__main__":
+    args = [int(float(x)) for x in sys.argv[1:]]
+    main(*args)
@@ -0,0 +1,62 @@
+import random
+import sys
+import time
+from array import array
+from typing import Any, Dict
+
+from algorithms.aggregate import GroupBy, np
+from storage.columnar import ColumnStore
+
+
+def make_store(n: int, groups: int = 64, seed: int = 0) -> ColumnStore:
+    rnd = random.Random(seed)
+    st = ColumnStore()
+    st.cat_names = [f"c{i}" for i in range(groups)]
+    st.cat_lookup = {c: i for i, c in enumerate(st.cat_names)}
+    st.ids = array("q", range(n))
+    st.vals = array("q", (rnd.randrange(1_000_000) for _ in range(n)))
+    st.cat_codes = array("i", (rnd.randrange(groups) for _ in range(n)))
+    st.text_offsets = array("q", bytes(8 * (n + 1)))
+    st.alive = bytearray(b"\x01" * n)
+    return st
+
+
+def naive(st: ColumnStore) -> Dict[str, Dict[str, Any]]:
+    out: Dict[str, Dict[str, Any]] = {}
+    for r in st:
+        g = out.get(r.category)
+        if g is None:
+            out[r.category] = {"count": 1, "sum": r.value, "min": r.value, "max": r.value}
+            continue
+        g["count"] += 1
+        g["sum"] += r.value
+        g["min"] = min(g["min"], r.value)
+        g["max"] = max(g["max"], r.value)
+    for g in out.values():
+        g["mean"] = g["sum"] / g["count"]
+    return out
+
+
+def timed(fn) -> Any:
+    t = time.perf_counter()
+    res = fn()
+    return res, time.perf_counter() - t
+
+
+def main(sizes=(1_000_000, 10_000_000)):
+    for n in sizes:
+        st = make_store(n)
+        gb = GroupBy(st.cat_names, st.cat_codes, st.vals)
+        ref, t_naive = timed(lambda: naive(st))
+        res, t_py = timed(lambda: gb.agg(use_numpy=False))
+        assert res == ref
+        line = f"n={n:>10,}  naive {t_naive:8.3f}s  python {t_py:8.3f}s"
+        if np is not None:
+            res, t_np = timed(lambda: gb.agg())
+            assert res == ref
+            line += f"  numpy {t_np:8.3f}s  (x{t_naive / t_np:,.0f} vs naive)"
+        print(line)
+
+
+if __name__ == "__main__":
+    main([int(x) for x in sys.argv[1:]] or (1_000_000, 10_000_000))
@@ -0,0 +1,134 @@
+import random
+import sys
+import time
+from array import array
+from collections import Counter
+from typing import Any, Callable, Dict, List
+
+from storage.associative import HashTableChaining, HashTableOpenAddressing
+
+
+class _Dict:
+    # dict behind the same put/get/delete surface, as the baseline.
+    def __init__(self):
+        self.d: Dict[Any, Any] = {}
+
+    def put_many(self, items):
+        self.d.update(items)
+
+    def get_many(self, ks, default=None):
+        get = self.d.get
+        return [get(k, default) for k in ks]
+
+    def delete(self, k):
+        return self.d.pop(k, None) is not None
+
+
+class _StopTheWorld(HashTableChaining):
+    # Moves every old chain on the first put after a doubling: the classic
+    # resize, for comparison with incremental rehashing.
+    rehash_batch = 1 << 62
+
+
+TABLES: Dict[str, Callable[[], Any]] = {"dict": _Dict, "open": HashTableOpenAddressing,
+                                        "chain": HashTableChaining}
+
+
+def _timed(fn: Callable[[], Any]) -> float:
+    t = time.perf_counter()
+    fn()
+    return time.perf_counter() - t
+
+
+def _put_many(table: Any, items: List[tuple]) -> None:
+    if hasattr(table, "put_many"):
+        table.put_many(items)
+    else:
+        for k, v in items:
+            table.put(k, v)
+
+
+def _get_many(table: Any, ks: List[Any]) -> List[Any]:
+    if hasattr(table, "get_many"):
+        return table.get_many(ks)
+    return [table.get(k) for k in ks]
+
+
+def histogram(counts: Counter, width: int = 40) -> str:
+    total = sum(counts.values())
+    mean = sum(length * c for length, c in counts.items()) / total
+    lines = [f"    mean {mean:.2f}  max {max(counts)}"]
+    for length in sorted(counts):
+        share = counts[length] / total
+        lines.append(f"    {length:>3} {share:7.2%} {'#' * max(1, round(share * width))}")
+    return "\n".join(lines)
+
+
+def put_latencies(table: Any, items: List[tuple]) -> array:
+    # Wall time of every single put, in ns, sorted.
+    clock = time.perf_counter_ns
+    put = table.put
+    out = array("q", bytes(8 * len(items)))
+    for i, (k, v) in enumerate(items):
+        t = clock()
+        put(k, v)
+        out[i] = clock() - t
+    return array("q", sorted(out))
+
+
+def main(n: int = 1_000_000):
+    rnd = random.Random(0)
+    keys = rnd.sample(range(1 << 40), n)
+    items = [(k, i) for i, k in enumerate(keys)]
+    hits = rnd.sample(keys, n)
+    misses = [k + (1 << 41) for k in hits]
+    doomed = hits[: n // 2]
+    ref = dict(items)
+    for name, factory in TABLES.items():
+        table = factory()
+        put = _timed(lambda: _put_many(table, items))
+        get = _timed(lambda: _get_many(table, hits))
+        miss = _timed(lambda: _get_many(table, misses))
+        assert _get_many(table, hits[:1000]) == [ref[k] for k in hits[:1000]]
+        dele = _timed(lambda: [table.delete(k) for k in doomed])
+        print(f"{name:<6} n={n:,}  put {put / n * 1e9:6.0f} ns  get {get / n * 1e9:6.0f} ns  "
+              f"miss {miss / n * 1e9:6.0f} ns  delete {dele / len(doomed) * 1e9:6.0f} ns")
+
+    # Ids spaced by a power of two share their low bits; slots come from the
+    # mixed hash, so they must spread as well as consecutive ids do.
+    stride = min(n, 100_000)
+    for name in ("open", "chain"):
+        for label, ks in (("consecutive", list(range(stride))), ("stride 4096", [i * 4096 for i in range(stride)])):
+            table = TABLES[name]()
+            put = _timed(lambda: _put_many(table, [(k, k) for k in ks]))
+            get = _timed(lambda: _get_many(table, ks))
+            worst = max(table.probe_lengths() if name == "open" else table.chain_lengths())
+            print(f"{name:<6} {label:<12} n={stride:,}  put {put / stride * 1e9:6.0f} ns  get {get / stride * 1e9:6.0f} ns  "
+                  f"max {'probe' if name == 'open' else 'chain'} {worst}")
+
+    # Probe lengths just below the growth threshold (3/4 full) and right
+    # after a doubling, for stored keys and for lookups of absent keys.
+    for load_n in (3 * (1 << 16) // 4 - 1, 3 * (1 << 16) // 8 + 1):
+        table = HashTableOpenAddressing()
+        table.put_many(items[:load_n])
+        print(f"\nopen addressing, {table.size:,} keys in {table.cap:,} slots (load {table.size / table.cap:.2f})")
+        print("  stored keys, slots from home + 1:")
+        print(histogram(table.probe_lengths()))
+        table.track_probes()
+        for k in misses[:load_n]:
+            table.get(k)
+        print("  misses, slots inspected:")
+        print(histogram(table.probes))
+
+    # Single-put latency while the chaining table doubles from 8 buckets to
+    # n keys, with incremental and with stop-the-world rehashing.
+    print(f"\nput latency, growing from empty to {n:,} keys (us)")
+    print(f"  {'':<14}{'p50':>8}{'p99':>8}{'p99.9':>8}{'p99.99':>9}{'max':>10}")
+    for name, factory in (("incremental", HashTableChaining), ("stop-the-world", _StopTheWorld)):
+        lat = put_latencies(factory(), items)
+        cols = [lat[min(n - 1, int(n * q))] / 1000 for q in (0.5, 0.99, 0.999, 0.9999)]
+        print(f"  {name:<14}{cols[0]:8.1f}{cols[1]:8.1f}{cols[2]:8.1f}{cols[3]:9.1f}{lat[-1] / 1000:10.1f}")
+
+
+if __name__ == "__main__":
+    main(*(int(float(x)) for x in sys.argv[1:]))
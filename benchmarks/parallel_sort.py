@@ -0,0 +1,36 @@
+import os
+import random
+import sys
+import time
+from array import array
+
+from algorithms.parallel_sort import np, parallel_sort
+
+
+def main(n: int = 10_000_000, max_workers: int = 0):
+    # Speedup of parallel_sort over sorted() as the worker count doubles up to
+    # max_workers (default: every core).
+    max_workers = max_workers or os.cpu_count() or 1
+    rnd = random.Random(0)
+    values = array("q", (rnd.randrange(-2**62, 2**62) for _ in range(n)))
+    print(f"n={n:,} cores={os.cpu_count()} numpy={'yes' if np is not None else 'no'}")
+
+    t = time.perf_counter()
+    ref = sorted(values)
+    base = time.perf_counter() - t
+    print(f"sorted()           {base:8.2f}s")
+
+    workers = 1
+    while True:
+        t = time.perf_counter()
+        out = parallel_sort(values, workers=workers)
+        elapsed = time.perf_counter() - t
+        assert out.tolist() == ref
+        print(f"parallel_sort w={workers:<3} {elapsed:8.2f}s  x{base / elapsed:5.2f} vs sorted()")
+        if workers >= max_workers:
+            break
+        workers = min(workers * 2, max_workers)
+
+
+if __name__ == "__main__":
+    main(*(int(float(x)) for x in sys.argv[1:]))
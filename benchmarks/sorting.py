@@ -0,0 +1,51 @@
+import random
+import sys
+import time
+from array import array
+from typing import Any, Callable, Dict, List
+
+from algorithms.sorting import counting_sort, np, plan_sort, radix_sort, sort
+from benchmarks.suite import DISTRIBUTIONS, make_values
+
+
+def fixed_choices(a: Any) -> Dict[str, Callable[[], List[int]]]:
+    out: Dict[str, Callable[[], List[int]]] = {"comparison": lambda: sorted(a), "radix": lambda: radix_sort(a),
+                                               "counting": lambda: counting_sort(a)}
+    if np is not None:
+        if isinstance(a, array):
+            out["numpy"] = lambda: np.sort(np.frombuffer(a, dtype=np.int64)).tolist()
+        else:
+            out["numpy"] = lambda: np.sort(np.array(a, dtype=np.int64)).tolist()
+    return out
+
+
+def best_of(fn: Callable[[], Any], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def main(sizes=(1_000, 10_000, 100_000, 1_000_000)):
+    worst = 0.0
+    for n in sizes:
+        for dist in DISTRIBUTIONS:
+            values = make_values(n, dist, random.Random(0))
+            for kind, a in (("list", values), ("array", array("q", values))):
+                ref = sorted(values)
+                assert sort(a) == ref
+                times = {name: best_of(fn) for name, fn in fixed_choices(a).items()}
+                t_sort = best_of(lambda: sort(a))
+                best = min(times, key=times.get)
+                ratio = t_sort / times[best]
+                worst = max(worst, ratio)
+                fixed = "  ".join(f"{k} {v * 1e3:8.2f}" for k, v in times.items())
+                print(f"n={n:>9,} {dist:<8} {kind:<5} sort {t_sort * 1e3:8.2f}ms "
+                      f"[{plan_sort(a).algorithm:<10}] best {best:<10} x{ratio:4.2f} | {fixed}")
+    print(f"worst sort()/best-fixed ratio: {worst:.2f}")
+
+
+if __name__ == "__main__":
+    main([int(float(x)) for x in sys.argv[1:]] or (1_000, 10_000, 100_000, 1_000_000))
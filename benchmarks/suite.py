@@ -0,0 +1,818 @@
+"""Benchmark every public function in algorithms.{sorting,searching,graphs,dp_greedy}
+and every public class in storage/*.
+
+    python -m benchmarks.suite                          # sizes 1e3..1e5, all distributions
+    python -m benchmarks.suite --sizes 1e3..1e7 --out run.json
+    python -m benchmarks.suite --baseline base.json     # exit 1 on regressions
+    python -m benchmarks.suite --only sorting --dists random,sorted
+
+Standard library only. Anything discovered in those modules without a case
+below is listed under "uncovered" so new code cannot silently go unmeasured.
+"""
+import argparse
+import gc
+import importlib
+import inspect
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from models import Record
+
+ALGORITHM_MODULES = ("algorithms.sorting", "algorithms.searching", "algorithms.graphs",
+                     "algorithms.dp_greedy", "algorithms.external_sort", "algorithms.parallel_sort")
+STORAGE_MODULES = ("storage.linear", "storage.associative", "storage.trees", "storage.specialized",
+                   "storage.graphs", "storage.columnar", "storage.inverted", "storage.persistence",
+                   "storage.registry", "storage.sketches", "storage.window", "storage.sorted_index")
+DISTRIBUTIONS = ("random", "sorted", "reversed", "dupes", "skewed")
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+CATEGORIES = 64
+
+# Classes and helpers that only exist as parts of another structure or
+# function; they are timed through it.
+COVERED_BY = {
+    "algorithms.sorting.numeric_array": "algorithms.sorting.select_many",
+    "storage.linear.SLLNode": "storage.linear.SinglyLinkedList",
+    "storage.linear.DLLNode": "storage.linear.DoublyLinkedList",
+    "storage.trees.BinaryNode": "storage.trees.BST",
+    "storage.trees.BSTNode": "storage.trees.BST",
+    "storage.trees.AVLNode": "storage.trees.AVL",
+    "storage.trees.RBNode": "storage.trees.RedBlackTree",
+    "storage.trees.TrieNode": "storage.trees.Trie",
+    "storage.registry.IndexSpec": "storage.registry.IndexRegistry",
+}
+
+
+# ---- inputs ----------------------------------------------------------------
+
+def make_values(n: int, dist: str, rnd: random.Random) -> List[int]:
+    if dist == "dupes":
+        return [rnd.randrange(16) for _ in range(n)]
+    if dist == "skewed":
+        # Heavy-tailed: most values small, a few very large.
+        return [int(rnd.paretovariate(1.2)) for _ in range(n)]
+    a = [rnd.randrange(1 << 31) for _ in range(n)]
+    if dist == "sorted":
+        a.sort()
+    elif dist == "reversed":
+        a.sort(reverse=True)
+    return a
+
+
+def make_categories(n: int, dist: str, rnd: random.Random) -> List[str]:
+    names = [f"c{i}" for i in range(CATEGORIES)]
+    if dist == "skewed":
+        weights = [1 / (i + 1) for i in range(CATEGORIES)]
+        return rnd.choices(names, weights, k=n)
+    if dist == "dupes":
+        return rnd.choices(names[:2], k=n)
+    return [names[rnd.randrange(CATEGORIES)] for _ in range(n)]
+
+
+def make_records(n: int, dist: str, rnd: random.Random) -> List[Record]:
+    vals = make_values(n, dist, rnd)
+    cats = make_categories(n, dist, rnd)
+    return [Record(i, c, v, f"t{v % 997}") for i, (c, v) in enumerate(zip(cats, vals))]
+
+
+def make_edges(n: int, rnd: random.Random, degree: int = 4) -> List[Tuple[int, int, int]]:
+    # A random spanning tree plus extra edges, so every vertex is reachable from 0.
+    edges = [(rnd.randrange(v), v, rnd.randrange(1, 100)) for v in range(1, n)]
+    edges += [(rnd.randrange(n), rnd.randrange(n), rnd.randrange(1, 100))
+              for _ in range(n * (degree - 1))]
+    return edges
+
+
+def adjacency(n: int, edges: List[Tuple[int, int, int]], weighted: bool, directed: bool = False) -> Dict[int, list]:
+    adj: Dict[int, list] = {v: [] for v in range(n)}
+    for u, v, w in edges:
+        adj[u].append((v, w) if weighted else v)
+        if not directed:
+            adj[v].append((u, w) if weighted else u)
+    return adj
+
+
+# ---- cases -------------------------------------------------------------------
+# setup(n, dist, rnd) builds the input outside the timer and returns a thunk.
+
+class Case:
+    def __init__(self, setup: Callable[[int, str, random.Random], Callable[[], Any]],
+                 max_n: int = 10_000_000, dists: Tuple[str, ...] = DISTRIBUTIONS, note: str = ""):
+        self.setup = setup
+        self.max_n = max_n
+        self.dists = dists
+        self.note = note
+
+
+CASES: Dict[str, Case] = {}
+QUADRATIC = 10_000
+GRAPH_DISTS = ("random",)
+
+
+def case(name: str, **kw: Any):
+    def deco(fn):
+        CASES[name] = Case(fn, **kw)
+        return fn
+    return deco
+
+
+def _sort_case(fn_name: str, **kw: Any) -> None:
+    def setup(n, dist, rnd):
+        fn = getattr(importlib.import_module("algorithms.sorting"), fn_name)
+        a = make_values(n, dist, rnd)
+        return lambda: fn(a)
+    CASES[f"algorithms.sorting.{fn_name}"] = Case(setup, **kw)
+
+
+for _name in ("bubble_sort", "selection_sort", "insertion_sort"):
+    _sort_case(_name, max_n=QUADRATIC)
+for _name in ("merge_sort", "quick_sort", "heap_sort", "radix_sort", "counting_sort", "sort"):
+    _sort_case(_name)
+
+
+@case("algorithms.sorting.plan_sort")
+def _plan_sort(n, dist, rnd):
+    from algorithms.sorting import plan_sort
+    a = make_values(n, dist, rnd)
+    return lambda: plan_sort(a)
+
+
+@case("algorithms.external_sort.external_sort", max_n=1_000_000,
+      note="key (category, -value, id), budget 1/10 of the input")
+def _external_sort(n, dist, rnd):
+    from algorithms.external_sort import _RECORD_OVERHEAD, external_sort, record_key
+    recs = make_records(n, dist, rnd)
+    key = record_key("category", "-value", "id")
+    budget = max(1 << 16, n * _RECORD_OVERHEAD // 10)
+    return lambda: sum(1 for _ in external_sort(recs, key, memory_limit=budget))
+
+
+def _select_case(fn_name: str, ranks: Callable[[int], Any], note: str) -> None:
+    def setup(n, dist, rnd):
+        from array import array
+        from storage.columnar import ColumnView
+        fn = getattr(importlib.import_module("algorithms.sorting"), fn_name)
+        col = ColumnView(array("q", make_values(n, dist, rnd)))
+        k = ranks(n)
+        return lambda: fn(col, k)
+    CASES[f"algorithms.sorting.{fn_name}"] = Case(setup, note=note)
+
+
+_select_case("nth_element", lambda n: n // 2, "median of a value column")
+_select_case("select_many", lambda n: [n // 2, n * 99 // 100], "p50 + p99 of a value column")
+_select_case("partial_sort", lambda n: max(1, n // 100), "smallest 1% of a value column")
+
+
+@case("algorithms.parallel_sort.parallel_sort", note="array('q') input, one worker per core")
+def _parallel_sort(n, dist, rnd):
+    from array import array
+    from algorithms.parallel_sort import parallel_sort
+    a = array("q", make_values(n, dist, rnd))
+    return lambda: parallel_sort(a)
+
+
+@case("algorithms.external_sort.record_key", note="key for n records")
+def _record_key(n, dist, rnd):
+    from algorithms.external_sort import record_key
+    recs = make_records(n, dist, rnd)
+    key = record_key("category", "-value", "id")
+    return lambda: [key(r) for r in recs]
+
+
+@case("algorithms.searching.linear_search", note="10 probes")
+def _linear_search(n, dist, rnd):
+    from algorithms.searching import linear_search
+    a = make_values(n, dist, rnd)
+    probes = [rnd.choice(a) for _ in range(10)]
+    return lambda: [linear_search(a, x) for x in probes]
+
+
+@case("algorithms.searching.binary_search", note="n probes")
+def _binary_search(n, dist, rnd):
+    from algorithms.searching import binary_search
+    a = sorted(make_values(n, dist, rnd))
+    probes = [rnd.choice(a) for _ in range(n)]
+    return lambda: [binary_search(a, x) for x in probes]
+
+
+def _bound_case(fn_name: str) -> None:
+    def setup(n, dist, rnd):
+        fn = getattr(importlib.import_module("algorithms.searching"), fn_name)
+        a = sorted(make_values(n, dist, rnd))
+        probes = [rnd.choice(a) for _ in range(n)]
+        return lambda: [fn(a, x) for x in probes]
+    CASES[f"algorithms.searching.{fn_name}"] = Case(setup, note="n probes")
+
+
+_bound_case("lower_bound")
+_bound_case("upper_bound")
+
+
+@case("algorithms.searching.search_many", note="n unsorted probes, one call")
+def _search_many(n, dist, rnd):
+    from algorithms.searching import search_many
+    a = sorted(make_values(n, dist, rnd))
+    probes = [rnd.choice(a) for _ in range(n)]
+    return lambda: search_many(a, probes)
+
+
+def _graph_case(fn_name: str, build: Callable[[int, random.Random], tuple], **kw: Any) -> None:
+    def setup(n, dist, rnd):
+        fn = getattr(importlib.import_module("algorithms.graphs"), fn_name)
+        args = build(n, rnd)
+        return lambda: fn(*args)
+    kw.setdefault("dists", GRAPH_DISTS)
+    CASES[f"algorithms.graphs.{fn_name}"] = Case(setup, **kw)
+
+
+_graph_case("dfs", lambda n, r: (adjacency(n, make_edges(n, r), False), 0), note="n vertices, 4n edges")
+_graph_case("bfs", lambda n, r: (adjacency(n, make_edges(n, r), False), 0), note="n vertices, 4n edges")
+_graph_case("dijkstra", lambda n, r: (adjacency(n, make_edges(n, r), True), 0), note="n vertices, 4n edges")
+_graph_case("prim_mst", lambda n, r: (adjacency(n, make_edges(n, r), True), 0), note="n vertices, 4n edges")
+_graph_case("kruskal_mst", lambda n, r: (list(range(n)), make_edges(n, r)), note="n vertices, 4n edges")
+_graph_case("bellman_ford", lambda n, r: (make_edges(n, r), list(range(n)), 0),
+            max_n=QUADRATIC, note="n vertices, 4n edges")
+_graph_case("floyd_warshall",
+            lambda n, r: (list(range(n // 10)), {(u, v): w for u, v, w in make_edges(n // 10, r)}),
+            max_n=3_000, note="n/10 vertices")
+
+
+@case("algorithms.graphs.topological_sort", dists=GRAPH_DISTS, note="DAG, n vertices, 4n edges")
+def _topological_sort(n, dist, rnd):
+    from algorithms.graphs import topological_sort
+    edges = [(min(u, v), max(u, v), w) for u, v, w in make_edges(n, rnd) if u != v]
+    adj = adjacency(n, edges, False, directed=True)
+    return lambda: topological_sort(adj)
+
+
+@case("algorithms.dp_greedy.factorial", max_n=100_000, dists=GRAPH_DISTS, note="factorial(n // 10)")
+def _factorial(n, dist, rnd):
+    from algorithms.dp_greedy import factorial
+    return lambda: factorial(n // 10)
+
+
+@case("algorithms.dp_greedy.divide_and_conquer_max")
+def _dc_max(n, dist, rnd):
+    from algorithms.dp_greedy import divide_and_conquer_max
+    a = make_values(n, dist, rnd)
+    return lambda: divide_and_conquer_max(a)
+
+
+@case("algorithms.dp_greedy.greedy_activity_selection")
+def _activity(n, dist, rnd):
+    from algorithms.dp_greedy import greedy_activity_selection
+    starts = make_values(n, dist, rnd)
+    iv = [(s, s + rnd.randrange(1, 1000)) for s in starts]
+    return lambda: greedy_activity_selection(iv)
+
+
+@case("algorithms.dp_greedy.knapsack_01", max_n=QUADRATIC, note="capacity 1000")
+def _knapsack(n, dist, rnd):
+    from algorithms.dp_greedy import knapsack_01
+    w = [v % 100 + 1 for v in make_values(n, dist, rnd)]
+    v = [rnd.randrange(1, 1000) for _ in range(n)]
+    return lambda: knapsack_01(w, v, 1000)
+
+
+# storage: one build-and-read workload per class.
+
+def _storage_case(name: str, **kw: Any):
+    return case(f"storage.{name}", **kw)
+
+
+@_storage_case("linear.Array", note="n writes + n reads")
+def _array(n, dist, rnd):
+    from storage.linear import Array
+    a = make_values(n, dist, rnd)
+    def run():
+        arr = Array(n)
+        for i, v in enumerate(a):
+            arr[i] = v
+        return [arr[i] for i in range(n)]
+    return run
+
+
+def _push_pop(cls_name: str, push: str, pop: Optional[str], ctor: Tuple = ()):
+    def setup(n, dist, rnd):
+        cls = getattr(importlib.import_module("storage.linear"), cls_name)
+        a = make_values(n, dist, rnd)
+        def run():
+            s = cls(*ctor) if ctor else cls()
+            f = getattr(s, push)
+            for v in a:
+                f(v)
+            if pop:
+                g = getattr(s, pop)
+                for _ in range(n):
+                    g()
+            else:
+                s.to_list()
+        return run
+    return setup
+
+
+for _cls, _push, _pop in (("DynamicArray", "append", "pop"), ("Stack", "push", "pop"),
+                          ("Queue", "enqueue", "dequeue"), ("Deque", "push_back", "pop_front"),
+                          ("SinglyLinkedList", "push_front", None),
+                          ("DoublyLinkedList", "append", None)):
+    CASES[f"storage.linear.{_cls}"] = Case(_push_pop(_cls, _push, _pop), note=f"n {_push} + drain")
+
+
+@_storage_case("linear.CircularList", note="n adds into capacity 1000 + to_list")
+def _circular(n, dist, rnd):
+    from storage.linear import CircularList
+    a = make_values(n, dist, rnd)
+    def run():
+        c = CircularList(1000)
+        for v in a:
+            c.add(v)
+        return c.to_list()
+    return run
+
+
+def _hash_case(cls_name: str):
+    def setup(n, dist, rnd):
+        cls = getattr(importlib.import_module("storage.associative"), cls_name)
+        keys = make_values(n, dist, rnd)
+        def run():
+            ht = cls()
+            for i, k in enumerate(keys):
+                ht.put(k, i)
+            return [ht.get(k) for k in keys]
+        return run
+    return setup
+
+
+CASES["storage.associative.HashTableChaining"] = Case(_hash_case("HashTableChaining"),
+                                                     note="n puts + n gets, growing from empty")
+
+
+@_storage_case("associative.HashTableOpenAddressing", note="put_many + get_many of n keys, growing from empty")
+def _open_addressing(n, dist, rnd):
+    from storage.associative import HashTableOpenAddressing
+    items = [(k, i) for i, k in enumerate(make_values(n, dist, rnd))]
+    keys = [k for k, _ in items]
+    def run():
+        ht = HashTableOpenAddressing()
+        ht.put_many(items)
+        return ht.get_many(keys)
+    return run
+
+
+def _tree_case(cls_name: str):
+    def setup(n, dist, rnd):
+        cls = getattr(importlib.import_module("storage.trees"), cls_name)
+        a = make_values(n, dist, rnd)
+        def run():
+            t = cls()
+            for v in a:
+                t.insert(v)
+            return [t.search(v) for v in a]
+        return run
+    return setup
+
+
+# The BST is unbalanced: sorted input makes every insert O(n).
+CASES["storage.trees.BST"] = Case(_tree_case("BST"), max_n=QUADRATIC, note="n inserts + n searches")
+CASES["storage.trees.AVL"] = Case(_tree_case("AVL"), note="n inserts + n searches")
+CASES["storage.trees.RedBlackTree"] = Case(_tree_case("RedBlackTree"), note="n inserts + n searches")
+
+
+@_storage_case("trees.Trie", note="n inserts + 100 prefix queries")
+def _trie(n, dist, rnd):
+    from storage.trees import Trie
+    words = [format(v, "x") for v in make_values(n, dist, rnd)]
+    prefixes = [w[:3] for w in words[:100]]
+    def run():
+        t = Trie()
+        for w in words:
+            t.insert(w)
+        return [t.starts_with(p) for p in prefixes]
+    return run
+
+
+def _heap_case(cls_name: str):
+    def setup(n, dist, rnd):
+        cls = getattr(importlib.import_module("storage.trees"), cls_name)
+        a = make_values(n, dist, rnd)
+        def run():
+            h = cls()
+            for v in a:
+                h.push(v)
+            return [h.pop() for _ in range(n)]
+        return run
+    return setup
+
+
+for _cls in ("MinHeap", "MaxHeap"):
+    CASES[f"storage.trees.{_cls}"] = Case(_heap_case(_cls), note="n pushes + n pops")
+
+
+@_storage_case("specialized.DSU", note="n unions + n finds")
+def _dsu(n, dist, rnd):
+    from storage.specialized import DSU
+    pairs = [(rnd.randrange(n), rnd.randrange(n)) for _ in range(n)]
+    def run():
+        d = DSU(n)
+        for a, b in pairs:
+            d.union(a, b)
+        return [d.find(a) for a, _ in pairs]
+    return run
+
+
+@_storage_case("specialized.BloomFilter", max_n=1_000_000, note="n adds + n lookups, m=8n k=4")
+def _bloom(n, dist, rnd):
+    from storage.specialized import BloomFilter
+    words = [str(v) for v in make_values(n, dist, rnd)]
+    def run():
+        b = BloomFilter(m=8 * n, k=4)
+        for w in words:
+            b.add(w)
+        return [b.might_contain(w) for w in words]
+    return run
+
+
+@_storage_case("specialized.SegmentTree", note="build + n range sums")
+def _segment(n, dist, rnd):
+    from storage.specialized import SegmentTree
+    a = make_values(n, dist, rnd)
+    qs = [tuple(sorted((rnd.randrange(n), rnd.randrange(n)))) for _ in range(n)]
+    def run():
+        st = SegmentTree(a)
+        return [st.query_sum(l, r) for l, r in qs]
+    return run
+
+
+@_storage_case("specialized.Fenwick", note="n adds + n range sums")
+def _fenwick(n, dist, rnd):
+    from storage.specialized import Fenwick
+    a = make_values(n, dist, rnd)
+    qs = [tuple(sorted((rnd.randrange(n), rnd.randrange(n)))) for _ in range(n)]
+    def run():
+        fw = Fenwick(n)
+        for i, v in enumerate(a):
+            fw.add(i, v)
+        return [fw.sum_range(l, r) for l, r in qs]
+    return run
+
+
+@_storage_case("graphs.GraphMatrix", max_n=QUADRATIC // 2, dists=GRAPH_DISTS, note="n vertices, 4n edges")
+def _graph_matrix(n, dist, rnd):
+    from storage.graphs import GraphMatrix
+    edges = make_edges(n, rnd)
+    vs = list(range(n))
+    def run():
+        g = GraphMatrix(vs)
+        for u, v, _ in edges:
+            g.add_edge(u, v)
+    return run
+
+
+def _graph_class_case(cls_name: str, weighted: bool):
+    def setup(n, dist, rnd):
+        cls = getattr(importlib.import_module("storage.graphs"), cls_name)
+        edges = make_edges(n, rnd)
+        def run():
+            g = cls()
+            for u, v, w in edges:
+                if weighted:
+                    g.add_edge(u, v, w)
+                else:
+                    g.add_edge(u, v)
+        return run
+    return setup
+
+
+for _cls, _w in (("GraphList", False), ("DirectedGraph", False), ("WeightedGraph", True)):
+    CASES[f"storage.graphs.{_cls}"] = Case(_graph_class_case(_cls, _w), dists=GRAPH_DISTS,
+                                           note="n vertices, 4n edges")
+
+
+@_storage_case("columnar.ColumnStore", note="extend n records + iterate")
+def _column_store(n, dist, rnd):
+    from storage.columnar import ColumnStore
+    recs = make_records(n, dist, rnd)
+    def run():
+        st = ColumnStore()
+        st.extend(recs)
+        return sum(1 for _ in st)
+    return run
+
+
+def _filled_store(n, dist, rnd):
+    from storage.columnar import ColumnStore
+    st = ColumnStore()
+    st.extend(make_records(n, dist, rnd))
+    return st
+
+
+@_storage_case("columnar.ColumnView", note="iterate + tolist")
+def _column_view(n, dist, rnd):
+    st = _filled_store(n, dist, rnd)
+    return lambda: (sum(st.values()), st.values().tolist())
+
+
+@_storage_case("columnar.TextView", note="iterate")
+def _text_view(n, dist, rnd):
+    st = _filled_store(n, dist, rnd)
+    return lambda: st.texts().tolist()
+
+
+@_storage_case("sorted_index.SortedIndex", note="add_many n values + n bounds in one batch")
+def _sorted_index(n, dist, rnd):
+    from storage.sorted_index import SortedIndex
+    a = make_values(n, dist, rnd)
+    probes = [rnd.choice(a) for _ in range(n)]
+    def run():
+        ix = SortedIndex()
+        ix.add_many(a)
+        return ix.search_many(probes)
+    return run
+
+
+@_storage_case("inverted.TextIndex", note="add_many n texts + 64 two-word AND queries")
+def _text_index(n, dist, rnd):
+    from storage.inverted import TextIndex
+    recs = make_records(n, dist, rnd)
+    rows = [(r.id, f"{r.category} {r.text}") for r in recs]
+    queries = [(recs[rnd.randrange(n)].category, recs[rnd.randrange(n)].text) for _ in range(64)]
+    def run():
+        ix = TextIndex()
+        ix.add_many(rows)
+        return [len(ix.search(q)) for q in queries]
+    return run
+
+
+@_storage_case("inverted.CategoryIndex", note="add_many n rows + 64 range queries")
+def _category_index(n, dist, rnd):
+    from storage.inverted import CategoryIndex
+    recs = make_records(n, dist, rnd)
+    rows = [(r.category, r.value, r.id) for r in recs]
+    cats = sorted({r.category for r in recs})
+    def run():
+        ix = CategoryIndex()
+        ix.add_many(rows)
+        return [len(ix.slots(c, (0, 1 << 30))) for c in cats]
+    return run
+
+
+@_storage_case("persistence.WriteAheadLog", note="n appends + flush + replay")
+def _wal(n, dist, rnd):
+    from storage.persistence import WriteAheadLog
+    recs = make_records(n, dist, rnd)
+    def run():
+        with tempfile.TemporaryDirectory() as d:
+            wal = WriteAheadLog(os.path.join(d, "bench.wal"))
+            for r in recs:
+                wal.append(("add", r))
+            wal.flush()
+            ops = wal.replay()
+            wal.close()
+            return len(ops)
+    return run
+
+
+@_storage_case("registry.IndexRegistry", note="register + build a set index over n slots")
+def _registry(n, dist, rnd):
+    from storage.registry import IndexRegistry, IndexSpec, LAZY
+    vals = make_values(n, dist, rnd)
+    def run():
+        reg = IndexRegistry(lambda: n)
+        reg.register(IndexSpec("vals", set, lambda ix, slot, r: ix.add(r),
+                               lambda ix, start, end: ix.update(vals[start:end]), mode=LAZY))
+        return len(reg.get("vals"))
+    return run
+
+
+@_storage_case("sketches.TopK", note="n pushes, k=10")
+def _topk(n, dist, rnd):
+    from storage.sketches import TopK
+    a = make_values(n, dist, rnd)
+    def run():
+        t = TopK(10)
+        for i, v in enumerate(a):
+            t.push(v, i)
+        return t.items()
+    return run
+
+
+@_storage_case("sketches.KLLSketch", note="n updates + 99 quantiles")
+def _kll(n, dist, rnd):
+    from storage.sketches import KLLSketch
+    a = make_values(n, dist, rnd)
+    qs = [i / 100 for i in range(1, 100)]
+    def run():
+        s = KLLSketch(seed=0)
+        for v in a:
+            s.update(v)
+        return s.quantiles(qs)
+    return run
+
+
+@_storage_case("sketches.CategorySketches", note="n adds + per-category median")
+def _category_sketches(n, dist, rnd):
+    from storage.sketches import CategorySketches
+    recs = make_records(n, dist, rnd)
+    def run():
+        cs = CategorySketches()
+        for r in recs:
+            cs.add(r.category, r.value, r.id)
+        return {c: cs.sketch(c).quantile(0.5) for c in cs.quant}
+    return run
+
+
+@_storage_case("window.RollingWindow", note="n pushes, window 1000, stats each push")
+def _rolling(n, dist, rnd):
+    from storage.window import RollingWindow
+    a = make_values(n, dist, rnd)
+    def run():
+        w = RollingWindow(1000)
+        for v in a:
+            w.push(v)
+            w.stats()
+    return run
+
+
+@_storage_case("window.WindowedAggregator", note="n adds, window 1000 per category")
+def _windowed(n, dist, rnd):
+    from storage.window import WindowedAggregator
+    rows = [(r.category, r.value) for r in make_records(n, dist, rnd)]
+    def run():
+        w = WindowedAggregator(1000)
+        w.extend(rows)
+        return w.stats()
+    return run
+
+
+# ---- runner ----------------------------------------------------------------
+
+def discover() -> List[str]:
+    names = []
+    for mod_name in ALGORITHM_MODULES:
+        mod = importlib.import_module(mod_name)
+        names += [f"{mod_name}.{n}" for n, obj in inspect.getmembers(mod, inspect.isfunction)
+                  if not n.startswith("_") and obj.__module__ == mod_name]
+    for mod_name in STORAGE_MODULES:
+        mod = importlib.import_module(mod_name)
+        names += [f"{mod_name}.{n}" for n, obj in inspect.getmembers(mod, inspect.isclass)
+                  if not n.startswith("_") and obj.__module__ == mod_name]
+    return names
+
+
+def time_thunk(thunk: Callable[[], Any], repeat: int, budget: float) -> float:
+    # Best of `repeat` runs, but stop repeating once `budget` seconds are spent.
+    best = float("inf")
+    spent = 0.0
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            t0 = time.perf_counter()
+            thunk()
+            dt = time.perf_counter() - t0
+        finally:
+            gc.enable()
+        best = min(best, dt)
+        spent += dt
+        if spent > budget:
+            break
+    return best
+
+
+def run(sizes=DEFAULT_SIZES, dists=DISTRIBUTIONS, only: Optional[str] = None,
+        repeat: int = 3, budget: float = 1.0, seed: int = 0,
+        log: Callable[[str], None] = lambda s: None) -> Dict[str, Any]:
+    discovered = discover()
+    uncovered = [n for n in discovered if n not in CASES and n not in COVERED_BY]
+    results = []
+    old_limit = sys.getrecursionlimit()
+    for name in discovered:
+        c = CASES.get(name)
+        if c is None or (only and only not in name):
+            continue
+        for n in sizes:
+            for dist in dists:
+                if dist not in c.dists:
+                    continue
+                row: Dict[str, Any] = {"name": name, "n": n, "dist": dist}
+                if n > c.max_n:
+                    row["skipped"] = f"n > {c.max_n:,}"
+                    results.append(row)
+                    continue
+                # Several of the measured functions recurse once per element.
+                sys.setrecursionlimit(max(old_limit, 4 * n + 1000))
+                try:
+                    thunk = c.setup(n, dist, random.Random(seed))
+                    row["seconds"] = time_thunk(thunk, repeat, budget)
+                except Exception as e:
+                    row["error"] = f"{type(e).__name__}: {e}"
+                finally:
+                    sys.setrecursionlimit(old_limit)
+                results.append(row)
+                log(_format_row(row))
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "cpus": os.cpu_count(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "sizes": list(sizes),
+            "dists": list(dists),
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "notes": {name: c.note for name, c in CASES.items() if c.note},
+        "uncovered": uncovered,
+        "results": results,
+    }
+
+
+def _format_row(row: Dict[str, Any]) -> str:
+    head = f"{row['name']:<48} n={row['n']:>10,} {row['dist']:<8}"
+    if "seconds" in row:
+        return f"{head} {row['seconds']:10.4f}s"
+    return f"{head} {row.get('error') or row.get('skipped')}"
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.25,
+            floor: float = 0.001) -> List[Dict[str, Any]]:
+    # A regression is a result slower than baseline by more than `threshold`
+    # (relative) and `floor` seconds (absolute, to ignore timer noise), or one
+    # that now errors.
+    base = {(r["name"], r["n"], r["dist"]): r for r in baseline.get("results", [])}
+    out = []
+    for r in current["results"]:
+        b = base.get((r["name"], r["n"], r["dist"]))
+        if b is None or "seconds" not in b:
+            continue
+        if "error" in r:
+            out.append({**r, "baseline": b["seconds"]})
+        elif "seconds" in r:
+            ratio = r["seconds"] / b["seconds"] if b["seconds"] else float("inf")
+            if ratio > 1 + threshold and r["seconds"] - b["seconds"] > floor:
+                out.append({**r, "baseline": b["seconds"], "ratio": ratio})
+    return out
+
+
+def _parse_sizes(spec: str) -> List[int]:
+    # "1e3,1e5" or "1e3..1e7" (every power of ten in between).
+    if ".." in spec:
+        lo, hi = (int(float(x)) for x in spec.split(".."))
+        sizes = []
+        while lo <= hi:
+            sizes.append(lo)
+            lo *= 10
+        return sizes
+    return [int(float(x)) for x in spec.split(",")]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m benchmarks.suite")
+    p.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES))
+    p.add_argument("--dists", default=",".join(DISTRIBUTIONS))
+    p.add_argument("--only", help="substring filter on the qualified name")
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--budget", type=float, default=1.0, help="stop repeating a case after this many seconds")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--out", help="write JSON results here")
+    p.add_argument("--baseline", help="JSON from an earlier run to compare against")
+    p.add_argument("--threshold", type=float, default=0.25)
+    p.add_argument("--quiet", action="store_true")
+    args = p.parse_args(argv)
+
+    dists = args.dists.split(",")
+    bad = [d for d in dists if d not in DISTRIBUTIONS]
+    if bad:
+        p.error(f"unknown distributions {bad}; expected some of {DISTRIBUTIONS}")
+    log = (lambda s: None) if args.quiet else (lambda s: print(s, file=sys.stderr, flush=True))
+    report = run(_parse_sizes(args.sizes), dists, args.only, args.repeat, args.budget, args.seed, log)
+
+    if report["uncovered"]:
+        log(f"uncovered (no benchmark case): {', '.join(report['uncovered'])}")
+    status = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        report["regressions"] = regressions
+        for r in regressions:
+            what = r.get("error") or f"{r['baseline']:.4f}s -> {r['seconds']:.4f}s (x{r['ratio']:.2f})"
+            log(f"REGRESSION {r['name']} n={r['n']:,} {r['dist']}: {what}")
+        status = 1 if regressions else 0
+    text = json.dumps(report, indent=1)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
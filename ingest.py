@@ -0,0 +1,178 @@
+import csv
+import io
+import multiprocessing
+import os
+from array import array
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+from storage.columnar import ColumnStore
+
+_COLUMNS = ("id", "category", "value", "text")
+
+
+def _scan_chunk(args: Tuple[str, int, int]) -> Tuple[int, List[Optional[int]]]:
+    # Quote count of [start, end) and, for each quote parity the chunk may be
+    # entered with, the offset just past its first newline that lies outside
+    # a quoted field. Escaped quotes ("") come in pairs and leave parity alone;
+    # as in RFC 4180, a quote is taken to appear only inside quoted fields.
+    path, start, end = args
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    first: List[Optional[int]] = [None, None]
+    pos, par = 0, 0
+    while first[0] is None or first[1] is None:
+        q = data.find(b'"', pos)
+        if first[par] is None:
+            nl = data.find(b"\n", pos, len(data) if q < 0 else q)
+            if nl >= 0:
+                first[par] = start + nl + 1
+        if q < 0:
+            break
+        pos, par = q + 1, par ^ 1
+    return data.count(b'"'), first
+
+
+def _cut_bounds(raw: List[Tuple[int, int]], scans: List[Tuple[int, List[Optional[int]]]]) -> List[Tuple[int, int]]:
+    # Each raw boundary moves to the first row start after it, using the
+    # quote parity carried in from the chunks before it; a chunk with no such
+    # newline (one long quoted field) just merges into its neighbour.
+    cuts = [raw[0][0]]
+    parity = 0
+    for (start, _), (quotes, first) in zip(raw, scans):
+        pos = first[parity]
+        if start > raw[0][0] and pos is not None and cuts[-1] < pos < raw[-1][1]:
+            cuts.append(pos)
+        parity ^= quotes & 1
+    cuts.append(raw[-1][1])
+    return list(zip(cuts, cuts[1:]))
+
+
+def _parse_shard(args: Tuple[str, int, int, Sequence[int]]) -> Tuple[str, int, int, List[str]]:
+    path, start, end, cols = args
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    i_id, i_cat, i_val, i_txt = cols
+    chunk = ColumnStore()
+    ids, vals, codes = chunk.ids, chunk.vals, chunk.cat_codes
+    offsets, blob, code = chunk.text_offsets, chunk.text_blob, chunk._code
+    for row in csv.reader(io.StringIO(data.decode("utf-8"), newline="")):
+        if not row:
+            continue
+        ids.append(int(row[i_id]))
+        vals.append(int(row[i_val]))
+        codes.append(code(row[i_cat]))
+        blob += row[i_txt].encode("utf-8")
+        offsets.append(len(blob))
+
+    parts = [ids, vals, codes, offsets, blob]
+    size = sum(len(p) * (p.itemsize if isinstance(p, array) else 1) for p in parts)
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    pos = 0
+    for p in parts:
+        raw = memoryview(p).cast("B")
+        shm.buf[pos:pos + len(raw)] = raw
+        pos += len(raw)
+        raw.release()
+    name = shm.name
+    shm.close()
+    # The parent unlinks the segment once it has copied it out; without this the
+    # worker's resource tracker would also try to reap it at worker exit.
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return name, len(ids), len(blob), chunk.cat_names
+
+
+def _attach(name: str, n: int, blob_len: int, cat_names: List[str]) -> ColumnStore:
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        buf = shm.buf
+        chunk = ColumnStore()
+        pos = 0
+        for col, nbytes in ((chunk.ids, 8 * n), (chunk.vals, 8 * n), (chunk.cat_codes, 4 * n)):
+            col.frombytes(buf[pos:pos + nbytes])
+            pos += nbytes
+        chunk.text_offsets = array("q")
+        chunk.text_offsets.frombytes(buf[pos:pos + 8 * (n + 1)])
+        pos += 8 * (n + 1)
+        chunk.text_blob = bytearray(buf[pos:pos + blob_len])
+        del buf
+    finally:
+        shm.close()
+        shm.unlink()
+    chunk.alive = bytearray(b"\x01" * n)
+    chunk.cat_names = list(cat_names)
+    chunk.cat_lookup = {c: i for i, c in enumerate(cat_names)}
+    return chunk
+
+
+def _unlink(name: str) -> None:
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
+
+
+def _attach_all(results: Iterator[Tuple[str, int, int, List[str]]]) -> List[ColumnStore]:
+    chunks = []
+    try:
+        for res in results:
+            chunks.append(_attach(*res))
+    finally:
+        # After a failure, unlink the segments of every shard not attached
+        # yet (a no-op once results is exhausted).
+        while True:
+            try:
+                res = next(results)
+            except StopIteration:
+                break
+            except Exception:
+                continue
+            _unlink(res[0])
+    return chunks
+
+
+def read_csv_columns(path: str, workers: Optional[int] = None) -> List[ColumnStore]:
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        header = next(csv.reader([f.readline().decode("utf-8-sig")]), [])
+        data_start = f.tell()
+    try:
+        cols = [header.index(c) for c in _COLUMNS]
+    except ValueError:
+        raise ValueError(f"{path}: header must contain {', '.join(_COLUMNS)}") from None
+    if workers == 1 or size - data_start < 2 * workers:
+        return _attach_all(iter([_parse_shard((path, data_start, size, cols))]))
+    edges = [data_start + (size - data_start) * k // workers for k in range(workers + 1)]
+    raw = list(zip(edges, edges[1:]))
+    with multiprocessing.Pool(workers) as pool:
+        # Two passes over the shards: a byte scan that fixes quote-safe cut
+        # points, then the csv parse of each shard.
+        bounds = _cut_bounds(raw, pool.map(_scan_chunk, [(path, a, b) for a, b in raw]))
+        return _attach_all(pool.imap(_parse_shard, [(path, a, b, cols) for a, b in bounds]))
+
+
+def load_csv_parallel(system: Any, path: str, workers: Optional[int] = None) -> int:
+    chunks = read_csv_columns(path, workers)
+    # Reject duplicates across shards and against existing rows before
+    # touching the system, so a bad file loads nothing.
+    seen = set()
+    total = 0
+    for chunk in chunks:
+        seen.update(chunk.ids)
+        total += len(chunk.ids)
+    if len(seen) != total:
+        seen.clear()
+        for chunk in chunks:
+            for i in chunk.ids:
+                if i in seen:
+                    raise ValueError(f"duplicate id={i} across shards")
+                seen.add(i)
+    if not seen.isdisjoint(system.by_id):
+        dup = next(i for i in seen if i in system.by_id)
+        raise ValueError(f"id={dup} already exists")
+    return sum(system.add_columns(chunk) for chunk in chunks)
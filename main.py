@@ -1,80 +1,330 @@
 import csv
-from typing import List, Dict, Any, Tuple
+import asyncio
+import time
+from collections import Counter
+from itertools import compress
+from typing import List, Dict, Any, Callable, Tuple, Iterable, Iterator, Optional
 
 from models import Record
 
-from storage.linear import DynamicArray, Stack, Queue, Deque, CircularList
+from storage.linear import Stack, Queue, Deque, CircularList
+from storage.columnar import ColumnStore, ColumnView, TextView
 from storage.associative import HashTableOpenAddressing, HashTableChaining
-from storage.trees import BST, AVL, RedBlackTree, Trie, MinHeap, MaxHeap
+from storage.trees import BST, AVL, RedBlackTree, Trie, MinHeap, MaxHeap, height
 from storage.specialized import DSU, BloomFilter, SegmentTree, Fenwick
 from storage.graphs import GraphList, DirectedGraph, WeightedGraph
+from storage.persistence import WriteAheadLog, write_snapshot, read_snapshot
+from storage.inverted import CategoryIndex, TextIndex
+from storage.sketches import CategorySketches
+from storage.window import WindowedAggregator
+from storage.sorted_index import SortedIndex
+from storage.registry import IndexRegistry, IndexSpec, EAGER, LAZY, DISABLED
 
 from algorithms.sorting import (
     bubble_sort, selection_sort, insertion_sort, merge_sort,
     quick_sort, heap_sort, counting_sort, radix_sort
 )
-from algorithms.searching import linear_search, binary_search
+from algorithms.searching import linear_search
 from algorithms.graphs import (
     dfs, bfs, dijkstra, bellman_ford, floyd_warshall,
     topological_sort, prim_mst, kruskal_mst
 )
+from algorithms.aggregate import GroupBy
+from algorithms.external_sort import external_sort, record_key
+from pipeline import EventPipeline
+from profiling import Profiler
 from algorithms.dp_greedy import factorial, divide_and_conquer_max, greedy_activity_selection, knapsack_01
 
 
+def iter_csv_batches(path: str, batch_size: int = 10000) -> Iterator[List[Record]]:
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        i_id, i_cat, i_val, i_txt = (header.index(c) for c in ("id", "category", "value", "text"))
+        batch: List[Record] = []
+        for row in reader:
+            batch.append(Record(int(row[i_id]), row[i_cat], int(row[i_val]), row[i_txt]))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
 def load_csv(path: str) -> List[Record]:
     out = []
-    with open(path, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            out.append(Record(int(row["id"]), row["category"], int(row["value"]), row["text"]))
+    for batch in iter_csv_batches(path):
+        out.extend(batch)
+    return out
+
+
+INDEX_NAMES = ("ht_open", "ht_chain", "bst", "avl", "rbt", "trie", "bloom", "minh", "maxh", "by_category", "sketches", "rolling", "sorted_values", "fulltext")
+
+
+def _balanced_order(keys: List[Any]) -> List[Any]:
+    # Midpoint-first order, so inserting a sorted batch does not degenerate the BST.
+    out = []
+    stack = [(0, len(keys) - 1)]
+    while stack:
+        lo, hi = stack.pop()
+        if lo > hi:
+            continue
+        mid = (lo + hi) // 2
+        out.append(keys[mid])
+        stack.append((mid + 1, hi))
+        stack.append((lo, mid - 1))
+    return out
+
+
+def _index_stats(ix: Any, shapes: bool = True) -> Dict[str, Any]:
+    # shapes=False keeps to O(1) fields for periodic dumps; probe/chain
+    # histograms, unbalanced tree heights, bloom fill and postings bytes all
+    # walk the whole structure.
+    if isinstance(ix, HashTableOpenAddressing):
+        out = {"size": ix.size, "capacity": ix.cap, "load": ix.size / ix.cap}
+        if shapes:
+            lengths = ix.probe_lengths()
+            out["max_probe"] = max(lengths, default=0)
+            out["mean_probe"] = sum(k * c for k, c in lengths.items()) / ix.size if ix.size else 0.0
+    elif isinstance(ix, HashTableChaining):
+        out = {"size": ix.size, "capacity": ix.cap, "rehashing": ix.rehashing()}
+        if shapes:
+            chains = ix.chain_lengths()
+            used = sum(chains.values()) - chains.get(0, 0)
+            out["max_chain"] = max(chains)
+            out["mean_chain"] = sum(k * c for k, c in chains.items()) / used if used else 0.0
+            out["chain_lengths"] = dict(sorted(chains.items()))
+    elif isinstance(ix, (BST, AVL, RedBlackTree)):
+        out = {}
+        if isinstance(ix, AVL):
+            out["height"] = ix.root.h if ix.root else 0
+        elif shapes:
+            out["height"] = height(ix.root)
+        if not isinstance(ix, BST):
+            out["size"] = len(ix)
+    elif isinstance(ix, BloomFilter):
+        out = {"m": ix.m, "k": ix.k}
+        if shapes:
+            out["fill"] = sum(1 for b in ix.bits if b) / ix.m
+    elif isinstance(ix, TextIndex):
+        out = {"tokens": len(ix.terms)}
+        if shapes:
+            out["bytes"] = ix.nbytes()
+    elif isinstance(ix, SortedIndex):
+        out = {"sorted": len(ix.keys), "pending": len(ix.pending)}
+        if shapes:
+            out["removed"] = sum(ix.removed.values())
+    else:
+        return {}
+    probes = getattr(ix, "probes", None)
+    if probes:
+        out["probes"] = dict(sorted(probes.items()))
     return out
 
 
 class DataAnalysisSystem:
-    def __init__(self):
-        self.records = DynamicArray()
-        self.by_id: Dict[int, Record] = {}
+    # Tombstoned slots are reclaimed once they outnumber live rows (and this floor),
+    # which keeps compaction amortized O(1) per delete.
+    compact_min_dead = 1024
+
+    def __init__(self, wal_path: Optional[str] = None, indexes: Optional[Dict[str, str]] = None,
+                 window_size: int = 1000, window_per_category: bool = True,
+                 events_maxlen: Optional[int] = 1 << 20, profile: bool = False):
+        self.window_size = window_size
+        self.window_per_category = window_per_category
+        self.records = ColumnStore()
+        self.by_id: Dict[int, int] = {}
         self.categories = set()
-
-        self.ht_open = HashTableOpenAddressing()
-        self.ht_chain = HashTableChaining()
+        self.category_counts: Dict[str, int] = {}
+        self.value_counts: Dict[int, int] = {}
 
         self.undo = Stack()
-        self.events = Queue()
+        # Drained by pipeline.EventPipeline; without one, the oldest events
+        # are dropped once events_maxlen is reached. A running pipeline lifts
+        # the cap and reports earlier drops to its subscribers.
+        self.events = Queue(maxlen=events_maxlen)
         self.window = Deque()
         self.recent = CircularList(capacity=5)
 
-        self.bst = BST()
-        self.avl = AVL()
-        self.rbt = RedBlackTree()
-        self.trie = Trie()
-        self.bloom = BloomFilter(m=2048, k=4)
-
-        self.minh = MinHeap()
-        self.maxh = MaxHeap()
+        self.profiler: Optional[Profiler] = None
+        self.indexes = IndexRegistry(self._extent)
+        if profile:
+            self.enable_profiling()
+        self._register_indexes(indexes or {})
+
+        self.wal = WriteAheadLog(wal_path) if wal_path else None
+
+    def __getattr__(self, name: str) -> Any:
+        # Secondary indexes are reached as attributes (self.bst, self.bloom, ...);
+        # lazy ones are built from the column store on first access.
+        if name.startswith("__") or name == "indexes":
+            raise AttributeError(name)
+        if name in self.indexes.specs:
+            return self.indexes.get(name)
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def _register_indexes(self, modes: Dict[str, str]) -> None:
+        unknown = set(modes) - set(INDEX_NAMES)
+        if unknown:
+            raise ValueError(f"unknown index names: {sorted(unknown)}")
+
+        def spec(name, factory, add, bulk, remove, rebuild_on_compact=False, default=EAGER):
+            return IndexSpec(name, factory, add, bulk, remove, rebuild_on_compact, modes.get(name, default))
+
+        for name, factory in (("ht_open", HashTableOpenAddressing), ("ht_chain", HashTableChaining)):
+            self.indexes.register(spec(
+                name, factory,
+                lambda ix, slot, r: ix.put(r.id, slot),
+                self._bulk_ids,
+                lambda ix, slot, r: ix.delete(r.id),
+                rebuild_on_compact=True))
+
+        self.indexes.register(spec(
+            "bst", BST,
+            lambda ix, slot, r: ix.insert(r.value),
+            self._bulk_tree,
+            self._remove_tree_value))
+        # AVL/RBT keep per-key counts, so they see every copy of a value.
+        for name, factory in (("avl", AVL), ("rbt", RedBlackTree)):
+            self.indexes.register(spec(
+                name, factory,
+                lambda ix, slot, r: ix.insert(r.value),
+                self._bulk_counted_tree,
+                lambda ix, slot, r: ix.delete(r.value)))
+
+        self.indexes.register(spec(
+            "trie", Trie,
+            lambda ix, slot, r: ix.insert(r.text),
+            self._bulk_trie,
+            lambda ix, slot, r: ix.delete(r.text)))
+        self.indexes.register(spec(
+            "bloom", lambda: BloomFilter(m=2048, k=4),
+            lambda ix, slot, r: ix.add(r.text),
+            lambda ix, start, end: ix.add_many(self.records.text(i) for i in self._live(start, end)),
+            lambda ix, slot, r: ix.remove(r.text)))
+
+        # The unbounded global heaps are superseded by "sketches" and are only
+        # built if something asks for them.
+        for name, factory in (("minh", MinHeap), ("maxh", MaxHeap)):
+            self.indexes.register(spec(
+                name, factory,
+                lambda ix, slot, r: ix.push(r.value),
+                lambda ix, start, end: ix.push_many(self._live_vals(start, end)),
+                lambda ix, slot, r: ix.discard(r.value),
+                rebuild_on_compact=True, default=LAZY))
+
+        self.indexes.register(spec(
+            "by_category", CategoryIndex,
+            lambda ix, slot, r: ix.add(r.category, r.value, slot),
+            lambda ix, start, end: ix.add_many(
+                (self.records.category(i), self.records.vals[i], i) for i in self._live(start, end)),
+            lambda ix, slot, r: ix.remove(r.category, slot),
+            rebuild_on_compact=True))
+
+        # A delete marks its category dirty; the next read of that category
+        # rebuilds only it, from _category_rows.
+        self.indexes.register(spec(
+            "sketches", lambda: CategorySketches(reload=self._category_rows),
+            lambda ix, slot, r: ix.add(r.category, r.value, r.id),
+            self._bulk_sketches,
+            lambda ix, slot, r: ix.discard(r.category)))
+
+        # Rolling aggregates follow the ingest stream: a delete does not pull
+        # its value back out of a window it has already entered.
+        self.indexes.register(spec(
+            "rolling", lambda: WindowedAggregator(self.window_size, self.window_per_category),
+            lambda ix, slot, r: ix.add(r.category, r.value),
+            lambda ix, start, end: ix.extend(
+                (self.records.category(i), self.records.vals[i]) for i in self._live(start, end)),
+            lambda ix, slot, r: None))
+
+        # Sorted copy of the value column for bound/range queries; built on
+        # first use, then kept current through its pending buffers.
+        self.indexes.register(spec(
+            "sorted_values", SortedIndex,
+            lambda ix, slot, r: ix.add(r.value),
+            lambda ix, start, end: ix.add_many(self._live_vals(start, end)),
+            lambda ix, slot, r: ix.remove(r.value),
+            default=LAZY))
+        # Token -> record-id postings behind search_text/top_text.
+        self.indexes.register(spec(
+            "fulltext", TextIndex,
+            lambda ix, slot, r: ix.add(r.id, r.text),
+            lambda ix, start, end: ix.add_many(
+                (self.records.ids[i], self.records.text(i)) for i in self._live(start, end)),
+            lambda ix, slot, r: ix.remove(r.id, r.text),
+            default=LAZY))
+
+    def _extent(self) -> int:
+        # Builds run over tombstoned slots too (bulk hooks skip them through
+        # _live); compaction is left to remove_record's threshold.
+        return self.records.slot_count()
+
+    def _live(self, start: int, end: int) -> Iterable[int]:
+        st = self.records
+        return compress(range(start, end), st.alive[start:end]) if st.dead else range(start, end)
+
+    def _live_vals(self, start: int, end: int) -> Iterable[int]:
+        st = self.records
+        return compress(st.vals[start:end], st.alive[start:end]) if st.dead else st.vals[start:end]
+
+    def _bulk_ids(self, ix: Any, start: int, end: int) -> None:
+        ids = self.records.ids
+        for slot in self._live(start, end):
+            ix.put(ids[slot], slot)
+
+    def _bulk_tree(self, ix: Any, start: int, end: int) -> None:
+        for v in _balanced_order(sorted(set(self._live_vals(start, end)))):
+            ix.insert(v)
+
+    def _bulk_counted_tree(self, ix: Any, start: int, end: int) -> None:
+        ix.bulk_insert(self._live_vals(start, end))
+
+    def _bulk_sketches(self, ix: CategorySketches, start: int, end: int) -> None:
+        st = self.records
+        for i in self._live(start, end):
+            ix.add(st.category(i), st.vals[i], st.ids[i])
+
+    def _category_rows(self, category: str) -> List[Tuple[int, int]]:
+        # (value, id) of the live rows in category.
+        st = self.records
+        if self.indexes.is_built("by_category"):
+            slots = self.by_category.slots(category)
+        else:
+            code = st.cat_lookup.get(category)
+            slots = [i for i, c in enumerate(st.cat_codes) if c == code and st.alive[i]]
+        return [(st.vals[i], st.ids[i]) for i in slots]
+
+    def _remove_tree_value(self, ix: Any, slot: int, r: Record) -> None:
+        if r.value not in self.value_counts:
+            ix.delete(r.value)
+
+    def _bulk_trie(self, ix: Trie, start: int, end: int) -> None:
+        for i in self._live(start, end):
+            ix.insert(self.records.text(i))
 
     def add_record(self, r: Record) -> None:
         if r.id in self.by_id:
             raise ValueError(f"id={r.id} already exists")
-        self.records.append(r)
-        self.by_id[r.id] = r
+        slot = self.records.append(r)
+        self.by_id[r.id] = slot
         self.categories.add(r.category)
+        self.category_counts[r.category] = self.category_counts.get(r.category, 0) + 1
+        self.value_counts[r.value] = self.value_counts.get(r.value, 0) + 1
 
-        self.ht_open.put(r.id, r)
-        self.ht_chain.put(r.id, r)
-
-        self.bst.insert(r.value)
-        self.avl.insert(r.value)
-        self.rbt.insert(r.value)
-
-        self.trie.insert(r.text)
-        self.bloom.add(r.text)
-
-        self.minh.push(r.value)
-        self.maxh.push(r.value)
+        if self.profiler is None:
+            for spec, ix in self.indexes.active:
+                spec.add(ix, slot, r)
+        else:
+            self._profiled_hooks("add", slot, r)
 
         self.undo.push(("remove", r.id))
         self.events.enqueue(("add", r.id))
+        if self.wal:
+            self.wal.append(("add", r))
+            self.wal.flush()
 
         self.window.push_back(r.id)
         if len(self.window) > 5:
@@ -82,34 +332,281 @@ class DataAnalysisSystem:
 
         self.recent.add(r.id)
 
+    def add_records(self, batch: Iterable[Record]) -> int:
+        batch = list(batch)
+        if not batch:
+            return 0
+        self._check_new_ids([r.id for r in batch])
+        start = self.records.slot_count()
+        self.records.extend(batch)
+        self._added(start, self.records.slot_count())
+        return len(batch)
+
+    def add_columns(self, chunk: ColumnStore) -> int:
+        chunk.compact()
+        if not len(chunk):
+            return 0
+        self._check_new_ids(chunk.ids)
+        start = self.records.slot_count()
+        self.records.extend_store(chunk)
+        self._added(start, self.records.slot_count())
+        return len(chunk)
+
+    def _check_new_ids(self, ids: Iterable[int]) -> None:
+        ids = list(ids)
+        uniq = set(ids)
+        if len(uniq) != len(ids):
+            seen = set()
+            dup = next(i for i in ids if i in seen or seen.add(i))
+            raise ValueError(f"duplicate id={dup} in batch")
+        if not uniq.isdisjoint(self.by_id):
+            dup = next(i for i in ids if i in self.by_id)
+            raise ValueError(f"id={dup} already exists")
+
+    def _added(self, start: int, end: int) -> None:
+        self._index_slots(start, end)
+        ids = self.records.ids[start:end]
+        for i in ids:
+            self.undo.push(("remove", i))
+            self.events.enqueue(("add", i))
+        if self.wal:
+            for slot in range(start, end):
+                self.wal.append(("add", self.records[slot]))
+            self.wal.flush()
+
+        for i in ids[-5:]:
+            self.window.push_back(i)
+        while len(self.window) > 5:
+            self.window.pop_front()
+
+        for i in ids[-self.recent.capacity:]:
+            self.recent.add(i)
+
+    def _index_slots(self, start: int, end: int, skip: Iterable[str] = ()) -> None:
+        st = self.records
+        self.by_id.update(zip(st.ids[start:end], range(start, end)))
+        for c, n in Counter(st.cat_codes[start:end]).items():
+            name = st.cat_names[c]
+            self.categories.add(name)
+            self.category_counts[name] = self.category_counts.get(name, 0) + n
+        for v, n in Counter(st.vals[start:end]).items():
+            self.value_counts[v] = self.value_counts.get(v, 0) + n
+
+        prof = self.profiler
+        for spec, ix in self.indexes.active:
+            if spec.name in skip:
+                continue
+            if prof is None:
+                spec.bulk(ix, start, end)
+                continue
+            t0 = time.perf_counter_ns()
+            spec.bulk(ix, start, end)
+            prof.observe(f"{spec.name}.bulk", time.perf_counter_ns() - t0)
+            prof.incr(f"{spec.name}.bulk_rows", end - start)
+        if prof is not None:
+            prof.tick(self._periodic_stats)
+
     def remove_record(self, record_id: int) -> None:
         if record_id not in self.by_id:
             raise KeyError(f"id={record_id} not found")
-        r = self.by_id[record_id]
-        del self.by_id[record_id]
-
-        new_list = [x for x in self.records.to_list() if x.id != record_id]
-        self.records = DynamicArray()
-        for x in new_list:
-            self.records.append(x)
+        slot = self.by_id.pop(record_id)
+        r = self.records[slot]
+        self.records.kill(slot)
+
+        n = self.category_counts[r.category] - 1
+        if n:
+            self.category_counts[r.category] = n
+        else:
+            del self.category_counts[r.category]
+            self.categories.discard(r.category)
+        n = self.value_counts[r.value] - 1
+        if n:
+            self.value_counts[r.value] = n
+        else:
+            del self.value_counts[r.value]
+
+        if self.profiler is None:
+            for spec, ix in list(self.indexes.active):
+                if spec.remove:
+                    spec.remove(ix, slot, r)
+                else:
+                    self.indexes.drop(spec.name)
+        else:
+            self._profiled_hooks("remove", slot, r)
 
         self.undo.push(("add", r))
         self.events.enqueue(("remove", record_id))
-
-    def values(self) -> List[int]:
-        return [rec.value for rec in self.records.to_list()]
-
-    def texts(self) -> List[str]:
-        return [rec.text for rec in self.records.to_list()]
+        if self.wal:
+            self.wal.append(("remove", record_id))
+            self.wal.flush()
+
+        if self.records.dead > max(self.compact_min_dead, len(self.records)):
+            self.compact()
+
+    def _profiled_hooks(self, op: str, slot: int, r: Record) -> None:
+        prof = self.profiler
+        clock = time.perf_counter_ns
+        for spec, ix in list(self.indexes.active):
+            hook = spec.add if op == "add" else spec.remove
+            if hook is None:
+                self.indexes.drop(spec.name)
+                prof.incr(f"{spec.name}.dropped")
+                continue
+            t0 = clock()
+            hook(ix, slot, r)
+            prof.observe(f"{spec.name}.{op}", clock() - t0)
+        prof.incr(op)
+        prof.tick(self._periodic_stats)
+
+    def enable_profiling(self, dump_every: Optional[float] = None,
+                         sink: Optional[Callable[[Dict[str, Any]], None]] = None) -> Profiler:
+        # Off by default: the unprofiled paths pay one `is None` check per call.
+        self.profiler = Profiler(dump_every, sink) if sink else Profiler(dump_every)
+        self.indexes.on_install = self._instrument
+        for name, ix in self.indexes.built.items():
+            self._instrument(name, ix)
+        return self.profiler
+
+    def disable_profiling(self) -> None:
+        self.profiler = None
+        self.indexes.on_install = None
+        for ix in self.indexes.built.values():
+            if hasattr(ix, "track_probes"):
+                ix.track_probes(False)
+
+    def _instrument(self, name: str, ix: Any) -> None:
+        if hasattr(ix, "track_probes"):
+            ix.track_probes()
+
+    def stats(self, shapes: bool = True) -> Dict[str, Any]:
+        # Structure shapes for every built index (never builds a lazy one), plus
+        # operation counters and latency histograms while profiling is enabled.
+        # Periodic profiler dumps pass shapes=False to skip the O(n) walks.
+        out: Dict[str, Any] = {
+            "records": len(self.records),
+            "tombstones": self.records.dead,
+            "events_queued": len(self.events),
+            "build_seconds": dict(self.indexes.build_seconds),
+            "indexes": {name: _index_stats(ix, shapes) for name, ix in self.indexes.built.items()},
+        }
+        if self.profiler is not None:
+            out.update(self.profiler.stats())
+        return out
+
+    def _periodic_stats(self) -> Dict[str, Any]:
+        return self.stats(shapes=False)
+
+    def compact(self) -> None:
+        if not self.records.dead:
+            return
+        self.records.compact()
+        self.by_id = {i: slot for slot, i in enumerate(self.records.ids)}
+        for spec, _ in list(self.indexes.active):
+            if spec.rebuild_on_compact:
+                self.indexes.build(spec.name)
+
+    def save_snapshot(self, path: str) -> None:
+        # The snapshot records how much of the WAL it covers, so a crash before
+        # the rotation below leaves a log that load_snapshot can still replay.
+        self.compact()
+        mark = (self.wal.generation, self.wal.position()) if self.wal else None
+        if self.indexes.is_built("bloom"):
+            write_snapshot(path, self.records, self.bloom.bits, self.bloom.k, mark)
+        else:
+            write_snapshot(path, self.records, wal_mark=mark)
+        if self.wal:
+            self.wal.reset()
+
+    @classmethod
+    def load_snapshot(cls, path: str, wal_path: Optional[str] = None,
+                      indexes: Optional[Dict[str, str]] = None) -> "DataAnalysisSystem":
+        sys = cls(indexes=indexes)
+        store, bloom_bits, bloom_k, mark = read_snapshot(path)
+        sys.records = store
+        skip = []
+        if bloom_bits and sys.indexes.specs["bloom"].mode != DISABLED:
+            bloom = BloomFilter(m=len(bloom_bits), k=bloom_k)
+            bloom.bits = bloom_bits
+            sys.indexes.install("bloom", bloom)
+            skip.append("bloom")
+        sys._index_slots(0, store.slot_count(), skip)
+        if wal_path:
+            wal = WriteAheadLog(wal_path)
+            start = 0
+            if mark and wal.generation == mark[0]:
+                start = mark[1]
+            elif mark and wal.generation != mark[0] + 1:
+                raise ValueError(f"{wal_path}: WAL generation {wal.generation} does not "
+                                 f"follow snapshot generation {mark[0]}")
+            pending: List[Record] = []
+            for kind, arg in wal.replay(start):
+                if kind == "add":
+                    pending.append(arg)
+                    continue
+                sys.add_records(pending)
+                pending = []
+                sys.remove_record(arg)
+            sys.add_records(pending)
+            sys.wal = wal
+        return sys
+
+    def query(self, category: Optional[str] = None,
+              value_range: Optional[Tuple[Optional[int], Optional[int]]] = None) -> List[Record]:
+        # value_range is inclusive; either bound may be None. Results come back
+        # ordered by value within each category.
+        return [self.records[slot] for slot in self.by_category.slots(category, value_range)]
+
+    def group_by(self, key: str = "category") -> GroupBy:
+        if key != "category":
+            raise ValueError("only group_by('category') is supported")
+        # Tombstoned rows are masked out rather than compacted away.
+        st = self.records
+        return GroupBy(st.cat_names, st.cat_codes, st.vals, st.alive if st.dead else None)
+
+    def sort_records(self, *columns: str, memory_limit: int = 64 << 20,
+                     fan_in: int = 64) -> Iterator[Record]:
+        # Streams live records ordered by columns such as ("category", "-value",
+        # "id"), spilling to temp files beyond memory_limit bytes.
+        return external_sort(iter(self.records), record_key(*(columns or ("id",))),
+                             memory_limit, fan_in)
+
+    def top_k(self, category: Optional[str] = None) -> List[Record]:
+        return [self.records[self.by_id[rid]] for _, rid in self.sketches.top_k(category)]
+
+    def quantile(self, q: float, category: Optional[str] = None) -> Optional[int]:
+        sk = self.sketches.sketch(category)
+        return sk.quantile(q) if sk else None
+
+    def rolling_stats(self, category: Optional[str] = None) -> Dict[str, Any]:
+        # count/sum/mean/min/max over the last window_size records (of `category`).
+        return self.rolling.stats(category)
+
+    def search_text(self, *query: str, op: str = "and") -> List[Record]:
+        # Records whose text holds every (op="and") or any (op="or") query word.
+        return [self.records[self.by_id[rid]] for rid in self.fulltext.search(query, op)]
+
+    def top_text(self, *query: str, k: int = 10, op: str = "and") -> List[Tuple[int, Record]]:
+        # (score, record) for the k best matches by query-word frequency.
+        return [(score, self.records[self.by_id[rid]]) for score, rid in self.fulltext.top_k(query, k, op)]
+
+    def get_record(self, record_id: int) -> Optional[Record]:
+        slot = self.by_id.get(record_id)
+        return None if slot is None else self.records[slot]
+
+    def values(self) -> ColumnView:
+        # Live rows only; tombstones stay until compaction's own threshold.
+        return self.records.values()
+
+    def texts(self) -> TextView:
+        return self.records.texts()
 
     def demo_search(self) -> None:
         vals = self.values()
         print("\n=== SEARCH ===")
         print("Linear search value=150 idx:", linear_search(vals, 150))
-        sorted_vals = merge_sort(vals)
-        print("Binary search value=150 idx:", binary_search(sorted_vals, 150), "in", sorted_vals)
-        print("Hash(Open) get id=4:", self.ht_open.get(4))
-        print("Hash(Chain) get id=4:", self.ht_chain.get(4))
+        print("Binary search value=150 idx:", self.sorted_values.find(150), "in", self.sorted_values)
+        print("Hash(Open) get id=4:", self.records[self.ht_open.get(4)])
+        print("Hash(Chain) get id=4:", self.records[self.ht_chain.get(4)])
 
     def demo_sorting(self) -> None:
         vals = self.values()
@@ -135,11 +632,15 @@ class DataAnalysisSystem:
         print("Trie prefix 'c':", self.trie.starts_with("c"))
         print("Bloom(cpu):", self.bloom.might_contain("cpu"))
         print("Bloom(unknown):", self.bloom.might_contain("unknown"))
+        print("Query category=sales value<=130:", [r.id for r in self.query("sales", (None, 130))])
+        print("Group by category:", self.group_by("category").agg("count", "sum", "max"))
 
     def demo_heaps(self) -> None:
         print("\n=== HEAPS ===")
         print("MinHeap peek:", self.minh.peek())
         print("MaxHeap peek:", self.maxh.peek())
+        print("Top-2 sales:", [r.id for r in self.top_k("sales")[:2]])
+        print("Median value:", self.quantile(0.5), "p90 logs:", self.quantile(0.9, "logs"))
 
     def demo_segment_fenwick(self) -> None:
         print("\n=== RANGE SUM (SEGMENT/FENWICK) ===")
@@ -227,13 +728,13 @@ class DataAnalysisSystem:
 def main():
     sys = DataAnalysisSystem()
 
-    data = load_csv("demo/sample_data.csv")
-    for r in data:
-        sys.add_record(r)
+    for batch in iter_csv_batches("demo/sample_data.csv"):
+        sys.add_records(batch)
 
     print("Loaded records:", len(sys.records))
     print("Recent (circular):", sys.recent.to_list())
     print("Window (deque):", sys.window.to_list())
+    print("Rolling sales:", sys.rolling_stats("sales"))
 
     sys.demo_search()
     sys.demo_sorting()
@@ -249,6 +750,16 @@ def main():
     print("After remove id=3 -> count:", len(sys.records))
     print("Undo top:", sys.undo.peek())
     print("Events queue len:", len(sys.events))
+    asyncio.run(drain_events(sys))
+
+
+async def drain_events(sys: DataAnalysisSystem) -> None:
+    counts = Counter()
+    pipeline = EventPipeline(sys)
+    pipeline.subscribe(lambda batch: counts.update(kind for kind, _ in batch), "counts")
+    async with pipeline:
+        pass
+    print("Pipeline drained:", dict(counts), "-> events queue len:", len(sys.events))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,178 @@
+import asyncio
+import inspect
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+Event = Tuple[str, Any]
+Handler = Callable[[List[Event]], Union[None, Awaitable[None]]]
+
+
+class _Subscriber:
+    def __init__(self, name: str, handler: Handler, maxsize: int):
+        self.name = name
+        self.handler = handler
+        self.is_async = inspect.iscoroutinefunction(handler)
+        # Bounded in batches: a slow subscriber stalls the pump once full.
+        self.queue: "asyncio.Queue[List[Event]]" = asyncio.Queue(maxsize)
+        self.task: Optional[asyncio.Task] = None
+        self.events = 0
+        self.batches = 0
+        self.max_depth = 0
+        self.busy_seconds = 0.0
+        self.errors = 0
+        self.last_error: Optional[BaseException] = None
+
+    async def run(self) -> None:
+        while True:
+            batch = await self.queue.get()
+            t0 = time.perf_counter()
+            try:
+                res = self.handler(batch)
+                if self.is_async:
+                    await res
+            except Exception as e:
+                # One failing batch must not stall the pump behind a dead task.
+                self.errors += 1
+                self.last_error = e
+            finally:
+                self.busy_seconds += time.perf_counter() - t0
+                self.events += len(batch)
+                self.batches += 1
+                self.queue.task_done()
+
+
+class EventPipeline:
+    # Drains system.events (("add", id) / ("remove", id) tuples) in micro-batches
+    # of up to batch_size and fans each batch out to every subscriber's bounded
+    # queue. When a subscriber falls `queue_batches` behind, the pump waits on
+    # it, system.events fills up, and async producers that await throttle()
+    # block once it holds high_water events. Synchronous ingest never yields
+    # to the pump, so while the pipeline runs system.events is uncapped
+    # instead of dropping its oldest events; drops from before start() reach
+    # subscribers as a ("dropped", count) event at the head of a batch.
+    def __init__(self, system: Any, batch_size: int = 512, queue_batches: int = 64,
+                 high_water: int = 65536, poll_interval: float = 0.005):
+        self.system = system
+        self.batch_size = batch_size
+        self.queue_batches = queue_batches
+        self.high_water = high_water
+        self.poll_interval = poll_interval
+        self.subscribers: Dict[str, _Subscriber] = {}
+        self._pump: Optional[asyncio.Task] = None
+        self._room: Optional[asyncio.Event] = None
+        self._started = 0.0
+        self._stopped = 0.0
+        self._in_flight = False
+        self._maxlen: Optional[int] = None
+        self._reported_drops = 0
+        self.events = 0
+        self.batches = 0
+        self.max_source_depth = 0
+
+    def subscribe(self, handler: Handler, name: Optional[str] = None,
+                  queue_batches: Optional[int] = None) -> str:
+        # handler(batch) may be a plain function or a coroutine function.
+        name = name or getattr(handler, "__qualname__", repr(handler))
+        if name in self.subscribers:
+            raise ValueError(f"subscriber {name!r} already exists")
+        sub = _Subscriber(name, handler, queue_batches or self.queue_batches)
+        self.subscribers[name] = sub
+        if self._pump is not None:
+            sub.task = asyncio.create_task(sub.run())
+        return name
+
+    async def start(self) -> None:
+        if self._pump is not None:
+            return
+        self._started = time.perf_counter()
+        self._stopped = 0.0
+        self._room = asyncio.Event()
+        self._room.set()
+        source = self.system.events
+        self._maxlen, source.maxlen = source.maxlen, None
+        for sub in self.subscribers.values():
+            sub.task = asyncio.create_task(sub.run())
+        self._pump = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        # Delivers everything already queued, then shuts the tasks down.
+        if self._pump is None:
+            return
+        await self.drain()
+        tasks = [self._pump] + [s.task for s in self.subscribers.values() if s.task]
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._pump = None
+        self._stopped = time.perf_counter()
+        self.system.events.maxlen = self._maxlen
+        for sub in self.subscribers.values():
+            sub.task = None
+
+    async def __aenter__(self) -> "EventPipeline":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.stop()
+
+    async def _run(self) -> None:
+        source = self.system.events
+        while True:
+            depth = len(source)
+            if depth > self.max_source_depth:
+                self.max_source_depth = depth
+            if not depth:
+                await asyncio.sleep(self.poll_interval)
+                continue
+            batch = source.dequeue_many(self.batch_size)
+            n = len(batch)
+            lost = source.dropped - self._reported_drops
+            if lost:
+                self._reported_drops = source.dropped
+                batch.insert(0, ("dropped", lost))
+            self._in_flight = True
+            for sub in self.subscribers.values():
+                await sub.queue.put(batch)
+                if sub.queue.qsize() > sub.max_depth:
+                    sub.max_depth = sub.queue.qsize()
+            self._in_flight = False
+            self.events += n
+            self.batches += 1
+            if len(source) < self.high_water:
+                self._room.set()
+
+    async def throttle(self) -> None:
+        # Call between ingest batches; returns once system.events is below
+        # high_water.
+        if self._pump is None:
+            raise RuntimeError("pipeline is not running")
+        while len(self.system.events) >= self.high_water:
+            self._room.clear()
+            await self._room.wait()
+
+    async def drain(self) -> None:
+        # Returns once every event enqueued so far has been handled.
+        if self._pump is None:
+            raise RuntimeError("pipeline is not running")
+        while len(self.system.events) or self._in_flight:
+            await asyncio.sleep(self.poll_interval)
+        for sub in self.subscribers.values():
+            await sub.queue.join()
+
+    def metrics(self) -> Dict[str, Any]:
+        elapsed = (self._stopped or time.perf_counter()) - self._started if self._started else 0.0
+        return {
+            "events": self.events,
+            "batches": self.batches,
+            "events_per_sec": self.events / elapsed if elapsed else 0.0,
+            "source_depth": len(self.system.events),
+            "max_source_depth": self.max_source_depth,
+            "dropped": self.system.events.dropped,
+            "subscribers": {
+                name: {"events": s.events, "batches": s.batches,
+                       "queue_depth": s.queue.qsize(), "max_queue_depth": s.max_depth,
+                       "busy_seconds": s.busy_seconds, "errors": s.errors}
+                for name, s in self.subscribers.items()
+            },
+        }
@@ -0,0 +1,82 @@
+import json
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+class LatencyHistogram:
+    # Power-of-two nanosecond buckets: bucket b holds samples in [2**(b-1), 2**b).
+    def __init__(self):
+        self.buckets: List[int] = [0] * 64
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def observe(self, ns: int) -> None:
+        self.buckets[ns.bit_length()] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def percentile(self, q: float) -> int:
+        # Upper bound of the bucket holding the q-th sample, in ns.
+        want = q * self.count
+        seen = 0
+        for b, c in enumerate(self.buckets):
+            seen += c
+            if c and seen >= want:
+                return min(1 << b, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        if not self.count:
+            return {"count": 0}
+        return {"count": self.count,
+                "mean_us": self.total / self.count / 1000,
+                "p50_us": self.percentile(0.5) / 1000,
+                "p99_us": self.percentile(0.99) / 1000,
+                "max_us": self.max / 1000,
+                "total_ms": self.total / 1e6}
+
+
+def _stderr_sink(report: Dict[str, Any]) -> None:
+    print(json.dumps(report), file=sys.stderr, flush=True)
+
+
+class Profiler:
+    # Per-operation latency histograms ("avl.add", "add_record", ...) plus plain
+    # counters. dump_every (seconds) makes tick() hand a stats report to sink
+    # at most that often.
+    def __init__(self, dump_every: Optional[float] = None,
+                 sink: Callable[[Dict[str, Any]], None] = _stderr_sink):
+        self.latency: Dict[str, LatencyHistogram] = {}
+        self.counters: Dict[str, int] = {}
+        self.dump_every = dump_every
+        self.sink = sink
+        self._last_dump = time.monotonic()
+
+    def observe(self, name: str, ns: int) -> None:
+        h = self.latency.get(name)
+        if h is None:
+            h = self.latency[name] = LatencyHistogram()
+        h.observe(ns)
+
+    def incr(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def tick(self, report: Callable[[], Dict[str, Any]]) -> None:
+        if self.dump_every is None:
+            return
+        now = time.monotonic()
+        if now - self._last_dump >= self.dump_every:
+            self._last_dump = now
+            self.sink(report())
+
+    def stats(self) -> Dict[str, Any]:
+        return {"counters": dict(self.counters),
+                "latency": {name: h.summary() for name, h in sorted(self.latency.items())}}
+
+    def reset(self) -> None:
+        self.latency.clear()
+        self.counters.clear()
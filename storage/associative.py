@@ -1,57 +1,349 @@
-from typing import Any, List, Tuple
+from array import array
+from collections import Counter
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+# Both tables index buckets by the low bits of a mixed hash. Python ints hash
+# to themselves, so ids spaced by a power of two would otherwise share their
+# low bits and pile into a few slots. The mix folds the high half down,
+# multiplies by 2**64 / phi to carry every bit upwards, then folds the
+# product's high bits back down. The result is a non-negative int64, so it
+# fits array("q") and -1 can mark a free slot.
+_PHI = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+_MASK63 = (1 << 63) - 1
+_EMPTY = -1
+
+def _mixed_hash(k: Any) -> int:
+    h = hash(k) & _MASK64
+    h ^= h >> 32
+    h = h * _PHI & _MASK64
+    return (h ^ (h >> 29)) & _MASK63
 
 class HashTableOpenAddressing:
-    def __init__(self, capacity: int = 101):
-        self.cap = capacity
-        self.keys = [None] * capacity
-        self.vals = [None] * capacity
+    # Robin Hood linear probing over parallel hash/key/value lists. The table
+    # doubles (power-of-two capacity, so a slot is mixed hash & mask) before
+    # it gets 3/4 full. Inserts move an entry that sits closer to its home
+    # slot out of the way, which keeps probe lengths short and lets a miss
+    # stop early; deletes shift the following run back a slot instead of
+    # leaving tombstones. Mixed hashes are cached so growth never calls
+    # hash() again.
+    def __init__(self, capacity: int = 8):
+        cap = 8
+        while cap < capacity:
+            cap <<= 1
+        self._alloc(cap)
         self.size = 0
+        # Probe-length histogram, filled only after track_probes().
+        self.probes: Optional[Counter] = None
+
+    def _alloc(self, cap: int) -> None:
+        self.cap = cap
+        self.mask = cap - 1
+        self.limit = cap - cap // 4
+        self.hashes: List[int] = [_EMPTY] * cap
+        self.keys: List[Any] = [None] * cap
+        self.vals: List[Any] = [None] * cap
+
+    def track_probes(self, on: bool = True) -> None:
+        self.probes = Counter() if on else None
 
-    def _hash(self, k: Any) -> int:
-        return hash(k) % self.cap
+    def probe_lengths(self) -> Counter:
+        # Slots each stored key sits from its home slot, plus one.
+        mask = self.mask
+        return Counter(((i - h) & mask) + 1 for i, h in enumerate(self.hashes) if h != _EMPTY)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _find(self, k: Any) -> int:
+        h = _mixed_hash(k)
+        mask, hashes, keys = self.mask, self.hashes, self.keys
+        i = h & mask
+        dist = 0
+        found = -1
+        while True:
+            hh = hashes[i]
+            # An entry nearer its home than we are to ours means k is absent.
+            if hh == _EMPTY or (i - hh) & mask < dist:
+                break
+            if hh == h and (keys[i] is k or keys[i] == k):
+                found = i
+                break
+            i = (i + 1) & mask
+            dist += 1
+        if self.probes is not None:
+            self.probes[dist + 1] += 1
+        return found
+
+    def _grow(self, need: int) -> None:
+        cap = self.cap
+        while need > cap - cap // 4:
+            cap <<= 1
+        old = [(h, k, v) for h, k, v in zip(self.hashes, self.keys, self.vals) if h != _EMPTY]
+        self._alloc(cap)
+        for h, k, v in old:
+            self._place(h, k, v)
+
+    def _place(self, h: int, k: Any, v: Any) -> None:
+        # Insert a key known to be absent.
+        mask, hashes, keys, vals = self.mask, self.hashes, self.keys, self.vals
+        i = h & mask
+        dist = 0
+        while True:
+            hh = hashes[i]
+            if hh == _EMPTY:
+                hashes[i], keys[i], vals[i] = h, k, v
+                return
+            d = (i - hh) & mask
+            if d < dist:
+                hashes[i], h = h, hh
+                keys[i], k = k, keys[i]
+                vals[i], v = v, vals[i]
+                dist = d
+            i = (i + 1) & mask
+            dist += 1
 
     def put(self, k: Any, v: Any) -> None:
-        i = self._hash(k)
-        start = i
-        while self.keys[i] is not None and self.keys[i] != k:
-            i = (i + 1) % self.cap
-            if i == start:
-                raise RuntimeError("HashTable full")
-        if self.keys[i] is None:
-            self.size += 1
-        self.keys[i] = k
-        self.vals[i] = v
+        h = _mixed_hash(k)
+        mask, hashes, keys = self.mask, self.hashes, self.keys
+        i = h & mask
+        dist = 0
+        while True:
+            hh = hashes[i]
+            if hh == _EMPTY or (i - hh) & mask < dist:
+                break
+            if hh == h and (keys[i] is k or keys[i] == k):
+                if self.probes is not None:
+                    self.probes[dist + 1] += 1
+                self.vals[i] = v
+                return
+            i = (i + 1) & mask
+            dist += 1
+        if self.probes is not None:
+            self.probes[dist + 1] += 1
+        if self.size >= self.limit:
+            self._grow(self.size + 1)
+        self._place(h, k, v)
+        self.size += 1
+
+    def put_many(self, items: Iterable[Tuple[Any, Any]]) -> None:
+        items = list(items)
+        if self.size + len(items) > self.limit:
+            self._grow(self.size + len(items))
+        put = self.put
+        for k, v in items:
+            put(k, v)
 
     def get(self, k: Any) -> Any:
-        i = self._hash(k)
-        start = i
-        while self.keys[i] is not None:
-            if self.keys[i] == k:
-                return self.vals[i]
-            i = (i + 1) % self.cap
-            if i == start:
-                break
-        return None
+        i = self._find(k)
+        return self.vals[i] if i >= 0 else None
+
+    def get_many(self, ks: Iterable[Any], default: Any = None) -> List[Any]:
+        # Same probe loop as _find, inlined; probes are not recorded.
+        mask, hashes, keys, vals = self.mask, self.hashes, self.keys, self.vals
+        out = []
+        put = out.append
+        for k in ks:
+            h = _mixed_hash(k)
+            i = h & mask
+            dist = 0
+            while True:
+                hh = hashes[i]
+                if hh == _EMPTY or (i - hh) & mask < dist:
+                    put(default)
+                    break
+                if hh == h and (keys[i] is k or keys[i] == k):
+                    put(vals[i])
+                    break
+                i = (i + 1) & mask
+                dist += 1
+        return out
+
+    def delete(self, k: Any) -> bool:
+        i = self._find(k)
+        if i < 0:
+            return False
+        mask, hashes, keys, vals = self.mask, self.hashes, self.keys, self.vals
+        # Backward shift: pull each following displaced entry one slot
+        # closer to home until a free slot or an entry already at home.
+        j = (i + 1) & mask
+        while hashes[j] != _EMPTY and (j - hashes[j]) & mask:
+            hashes[i], keys[i], vals[i] = hashes[j], keys[j], vals[j]
+            i = j
+            j = (j + 1) & mask
+        hashes[i], keys[i], vals[i] = _EMPTY, None, None
+        self.size -= 1
+        return True
 
 class HashTableChaining:
-    def __init__(self, capacity: int = 101):
-        self.cap = capacity
-        self.buckets: List[List[Tuple[Any, Any]]] = [[] for _ in range(capacity)]
+    # Separate chaining over parallel entry arrays: entry e has e_hash[e]
+    # (its _mixed_hash), e_key[e], e_val[e] and e_next[e], the next entry in
+    # its chain (or in the free list once deleted); heads[b] is the first
+    # entry of bucket b, -1 if empty. Bucket counts are powers of two and
+    # double once the table holds more keys than buckets. Growth is
+    # incremental, as in Redis: the old heads stay live next to the new ones,
+    # and every put/delete relinks the next `rehash_batch` old chains into the
+    # new array. Both arrays take the low bits of the same mixed hash, so new
+    # bucket j draws only from old bucket j & old_mask. Entries never move,
+    # and a key's chain is in the old array until its old bucket is migrated.
+    rehash_batch = 1
+
+    def __init__(self, capacity: int = 8):
+        cap = 8
+        while cap < capacity:
+            cap <<= 1
+        self.cap = cap
+        self.mask = cap - 1
+        self.heads = array("q", [-1]) * cap
+        self.e_hash = array("q")
+        self.e_next = array("q")
+        self.e_key: List[Any] = []
+        self.e_val: List[Any] = []
+        self.free = -1
+        self.size = 0
+        # While rehashing: the old heads and the first old bucket not yet moved.
+        self.old_heads: Optional[array] = None
+        self.old_mask = 0
+        self.migrated = 0
+        # Length of the chain each operation walked, filled only after track_probes().
+        self.probes: Optional[Counter] = None
+
+    def track_probes(self, on: bool = True) -> None:
+        self.probes = Counter() if on else None
+
+    def __len__(self) -> int:
+        return self.size
+
+    def rehashing(self) -> bool:
+        return self.old_heads is not None
+
+    def _chain_starts(self) -> Iterator[int]:
+        # First entry of every live bucket (-1 for an empty one).
+        old = self.old_heads
+        if old is None:
+            yield from self.heads
+            return
+        yield from old[self.migrated:]
+        omask = self.old_mask
+        for b, e in enumerate(self.heads):
+            if b & omask < self.migrated:
+                yield e
 
-    def _hash(self, k: Any) -> int:
-        return hash(k) % self.cap
+    def chain_lengths(self) -> Counter:
+        nxt = self.e_next
+        out = Counter()
+        for e in self._chain_starts():
+            n = 0
+            while e >= 0:
+                n += 1
+                e = nxt[e]
+            out[n] += 1
+        return out
+
+    def _bucket(self, h: int) -> Tuple[array, int]:
+        old = self.old_heads
+        if old is not None and h & self.old_mask >= self.migrated:
+            return old, h & self.old_mask
+        return self.heads, h & self.mask
+
+    def _grow(self) -> None:
+        self.old_heads, self.old_mask = self.heads, self.mask
+        self.migrated = 0
+        self.cap <<= 1
+        self.mask = self.cap - 1
+        self.heads = array("q", [-1]) * self.cap
+
+    def _rehash(self, batch: int) -> None:
+        # Relink up to `batch` non-empty old chains (visiting at most 10x as
+        # many empty buckets) into the new heads.
+        old, heads, mask = self.old_heads, self.heads, self.mask
+        ehash, nxt = self.e_hash, self.e_next
+        b, end = self.migrated, len(old)
+        empty = 10 * batch
+        while b < end and batch and empty:
+            e = old[b]
+            if e < 0:
+                empty -= 1
+            else:
+                while e >= 0:
+                    after = nxt[e]
+                    j = ehash[e] & mask
+                    nxt[e] = heads[j]
+                    heads[j] = e
+                    e = after
+                old[b] = -1
+                batch -= 1
+            b += 1
+        self.migrated = b
+        if b == end:
+            self.old_heads = None
 
     def put(self, k: Any, v: Any) -> None:
-        b = self.buckets[self._hash(k)]
-        for i, (kk, _) in enumerate(b):
-            if kk == k:
-                b[i] = (k, v)
-                return
-        b.append((k, v))
+        if self.old_heads is not None:
+            self._rehash(self.rehash_batch)
+        h = _mixed_hash(k)
+        heads, b = self._bucket(h)
+        ehash, keys, nxt = self.e_hash, self.e_key, self.e_next
+        e = heads[b]
+        n = 0
+        while e >= 0:
+            if ehash[e] == h and (keys[e] is k or keys[e] == k):
+                self.e_val[e] = v
+                break
+            e = nxt[e]
+            n += 1
+        if self.probes is not None:
+            self.probes[n] += 1
+        if e >= 0:
+            return
+        e = self.free
+        if e >= 0:
+            self.free = nxt[e]
+            ehash[e], keys[e], self.e_val[e], nxt[e] = h, k, v, heads[b]
+        else:
+            e = len(keys)
+            ehash.append(h)
+            keys.append(k)
+            self.e_val.append(v)
+            nxt.append(heads[b])
+        heads[b] = e
+        self.size += 1
+        if self.size > self.cap and self.old_heads is None:
+            self._grow()
 
     def get(self, k: Any) -> Any:
-        b = self.buckets[self._hash(k)]
-        for kk, vv in b:
-            if kk == k:
-                return vv
-        return None
+        # Reads never migrate buckets, so lookups stay free of writes.
+        h = _mixed_hash(k)
+        heads, b = self._bucket(h)
+        ehash, keys, nxt = self.e_hash, self.e_key, self.e_next
+        e = heads[b]
+        n = 0
+        while e >= 0:
+            if ehash[e] == h and (keys[e] is k or keys[e] == k):
+                break
+            e = nxt[e]
+            n += 1
+        if self.probes is not None:
+            self.probes[n + (e >= 0)] += 1
+        return self.e_val[e] if e >= 0 else None
+
+    def delete(self, k: Any) -> bool:
+        if self.old_heads is not None:
+            self._rehash(self.rehash_batch)
+        h = _mixed_hash(k)
+        heads, b = self._bucket(h)
+        ehash, keys, nxt = self.e_hash, self.e_key, self.e_next
+        prev, e = -1, heads[b]
+        while e >= 0:
+            if ehash[e] == h and (keys[e] is k or keys[e] == k):
+                if prev < 0:
+                    heads[b] = nxt[e]
+                else:
+                    nxt[prev] = nxt[e]
+                keys[e] = self.e_val[e] = None
+                nxt[e] = self.free
+                self.free = e
+                self.size -= 1
+                return True
+            prev, e = e, nxt[e]
+        return False
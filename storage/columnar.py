@@ -0,0 +1,178 @@
+from array import array
+from itertools import compress
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from models import Record
+
+
+class ColumnView:
+    # Read-only window over a typed column. It holds a reference, not a copy,
+    # and does not export a buffer, so the column can keep growing under it.
+    # With `slots`, it shows only those rows (the live slots when the view
+    # was taken), in order; take a new view after further deletes.
+    def __init__(self, col: array, slots: Optional[array] = None):
+        self._col = col
+        self._slots = slots
+    def __len__(self): return len(self._col) if self._slots is None else len(self._slots)
+    def __getitem__(self, i: Any):
+        col, slots = self._col, self._slots
+        if slots is None:
+            return col[i].tolist() if isinstance(i, slice) else col[i]
+        if isinstance(i, slice):
+            return list(map(col.__getitem__, slots[i]))
+        return col[slots[i]]
+    def __iter__(self) -> Iterator[int]:
+        if self._slots is None:
+            return iter(self._col)
+        return map(self._col.__getitem__, self._slots)
+    def __repr__(self): return repr(self.tolist())
+    def tolist(self) -> List[int]:
+        return self._col.tolist() if self._slots is None else list(self)
+    def column(self) -> array:
+        # The column itself, for bulk readers (NumPy views, C-level scans).
+        # Callers must not mutate it or hold a buffer across appends. A view
+        # over selected slots returns a packed copy of those rows.
+        if self._slots is None:
+            return self._col
+        return array(self._col.typecode, self)
+
+
+class TextView:
+    # Texts by position; with `slots`, positions index the live slots taken
+    # when the view was made, like ColumnView.
+    def __init__(self, store: "ColumnStore", slots: Optional[array] = None):
+        self._store = store
+        self._slots = slots
+    def __len__(self): return len(self._store) if self._slots is None else len(self._slots)
+    def __getitem__(self, i: int) -> str:
+        return self._store.text(i if self._slots is None else self._slots[i])
+    def __iter__(self) -> Iterator[str]:
+        slots = self._store.live_slots() if self._slots is None else self._slots
+        for i in slots:
+            yield self._store.text(i)
+    def __repr__(self): return repr(self.tolist())
+    def tolist(self) -> List[str]: return list(self)
+
+
+class ColumnStore:
+    def __init__(self):
+        self.ids = array("q")
+        self.vals = array("q")
+        self.cat_codes = array("i")
+        self.cat_names: List[str] = []
+        self.cat_lookup: Dict[str, int] = {}
+        self.text_offsets = array("q", [0])
+        self.text_blob = bytearray()
+        self.alive = bytearray()
+        self.dead = 0
+
+    def _code(self, category: str) -> int:
+        c = self.cat_lookup.get(category)
+        if c is None:
+            c = len(self.cat_names)
+            self.cat_names.append(category)
+            self.cat_lookup[category] = c
+        return c
+
+    def append(self, r: Record) -> int:
+        slot = len(self.ids)
+        self.ids.append(r.id)
+        self.vals.append(r.value)
+        self.cat_codes.append(self._code(r.category))
+        self.text_blob += r.text.encode("utf-8")
+        self.text_offsets.append(len(self.text_blob))
+        self.alive.append(1)
+        return slot
+
+    def extend(self, records: Iterable[Record]) -> None:
+        for r in records:
+            self.append(r)
+
+    def extend_store(self, other: "ColumnStore") -> None:
+        other.compact()
+        remap = [self._code(c) for c in other.cat_names]
+        self.ids.extend(other.ids)
+        self.vals.extend(other.vals)
+        if remap == list(range(len(remap))):
+            self.cat_codes.extend(other.cat_codes)
+        else:
+            self.cat_codes.extend(array("i", (remap[c] for c in other.cat_codes)))
+        base = len(self.text_blob)
+        self.text_offsets.extend(array("q", (o + base for o in other.text_offsets[1:])))
+        self.text_blob += other.text_blob
+        self.alive += b"\x01" * len(other.ids)
+
+    # Lengths and iteration only count live rows; indexing is by slot.
+    def __len__(self): return len(self.ids) - self.dead
+
+    def __getitem__(self, i: int) -> Record:
+        if i < 0:
+            i = self._from_end(i)
+        return Record(self.ids[i], self.category(i), self.vals[i], self.text(i))
+
+    def _from_end(self, i: int) -> int:
+        # Negative slots count from the end, as for the id/value arrays; text
+        # lookups need the positive slot to pair offsets[i] with offsets[i + 1].
+        j = i + len(self.ids)
+        if j < 0:
+            raise IndexError(f"slot {i} out of range")
+        return j
+
+    def __iter__(self) -> Iterator[Record]:
+        for i in self.live_slots():
+            yield self[i]
+
+    def slot_count(self) -> int:
+        return len(self.ids)
+
+    def live_slots(self) -> Iterator[int]:
+        if not self.dead:
+            return iter(range(len(self.ids)))
+        return (i for i, a in enumerate(self.alive) if a)
+
+    def kill(self, slot: int) -> None:
+        if self.alive[slot]:
+            self.alive[slot] = 0
+            self.dead += 1
+
+    def compact(self) -> None:
+        if not self.dead:
+            return
+        keep = [i for i, a in enumerate(self.alive) if a]
+        ids, vals, codes = self.ids, self.vals, self.cat_codes
+        self.ids = array("q", (ids[i] for i in keep))
+        self.vals = array("q", (vals[i] for i in keep))
+        self.cat_codes = array("i", (codes[i] for i in keep))
+        offs, blob = self.text_offsets, self.text_blob
+        self.text_offsets = array("q", [0])
+        self.text_blob = bytearray()
+        for i in keep:
+            self.text_blob += blob[offs[i]:offs[i + 1]]
+            self.text_offsets.append(len(self.text_blob))
+        self.alive = bytearray(b"\x01" * len(keep))
+        self.dead = 0
+
+    def category(self, i: int) -> str:
+        return self.cat_names[self.cat_codes[i]]
+
+    def text(self, i: int) -> str:
+        if i < 0:
+            i = self._from_end(i)
+        return self.text_blob[self.text_offsets[i]:self.text_offsets[i + 1]].decode("utf-8")
+
+    def _live_slot_array(self) -> Optional[array]:
+        # Slot numbers of the live rows, or None when every row is live.
+        if not self.dead:
+            return None
+        return array("q", compress(range(len(self.ids)), self.alive))
+
+    # With tombstones present the views cover the live rows as of the call,
+    # so reading them never forces a compaction.
+    def values(self) -> ColumnView:
+        return ColumnView(self.vals, self._live_slot_array())
+
+    def texts(self) -> TextView:
+        return TextView(self, self._live_slot_array())
+
+    def to_list(self) -> List[Record]:
+        return list(self)
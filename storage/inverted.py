@@ -0,0 +1,367 @@
+import heapq
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from itertools import accumulate
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+class _Postings:
+    # Slots of one category sorted by (value, slot), with the values alongside,
+    # so a value range is two bisections away. Writes land in small pending
+    # buffers and are merged into the sorted arrays on the next read.
+    def __init__(self):
+        self.vals = array("q")
+        self.slots = array("q")
+        self.pending: List[Tuple[int, int]] = []
+        self.removed: Set[int] = set()
+        self.size = 0
+
+    def add(self, value: int, slot: int) -> None:
+        self.pending.append((value, slot))
+        self.size += 1
+
+    def extend(self, pairs: List[Tuple[int, int]]) -> None:
+        self.pending.extend(pairs)
+        self.size += len(pairs)
+
+    def remove(self, slot: int) -> None:
+        self.removed.add(slot)
+        self.size -= 1
+
+    def _merge(self) -> None:
+        removed = self.removed
+        main = zip(self.vals, self.slots)
+        pending = sorted(self.pending)
+        if removed:
+            main = ((v, s) for v, s in main if s not in removed)
+            pending = [p for p in pending if p[1] not in removed]
+        merged = list(heapq.merge(main, pending)) if pending else list(main)
+        self.vals = array("q", (v for v, _ in merged))
+        self.slots = array("q", (s for _, s in merged))
+        self.pending = []
+        self.removed = set()
+
+    def range(self, lo: Optional[int], hi: Optional[int]) -> array:
+        if self.pending or self.removed:
+            self._merge()
+        i = 0 if lo is None else bisect_left(self.vals, lo)
+        j = len(self.vals) if hi is None else bisect_right(self.vals, hi)
+        return self.slots[i:j]
+
+
+class CategoryIndex:
+    def __init__(self):
+        self.postings: Dict[str, _Postings] = {}
+
+    def add(self, category: str, value: int, slot: int) -> None:
+        p = self.postings.get(category)
+        if p is None:
+            p = self.postings[category] = _Postings()
+        p.add(value, slot)
+
+    def add_many(self, rows: Iterable[Tuple[str, int, int]]) -> None:
+        grouped: Dict[str, List[Tuple[int, int]]] = {}
+        for category, value, slot in rows:
+            grouped.setdefault(category, []).append((value, slot))
+        for category, pairs in grouped.items():
+            p = self.postings.get(category)
+            if p is None:
+                p = self.postings[category] = _Postings()
+            p.extend(pairs)
+
+    def remove(self, category: str, slot: int) -> None:
+        p = self.postings.get(category)
+        if p is None:
+            return
+        p.remove(slot)
+        if not p.size:
+            del self.postings[category]
+
+    def count(self, category: str) -> int:
+        p = self.postings.get(category)
+        return p.size if p else 0
+
+    def slots(self, category: Optional[str] = None,
+              value_range: Optional[Tuple[Optional[int], Optional[int]]] = None) -> List[int]:
+        lo, hi = value_range if value_range else (None, None)
+        if category is not None:
+            p = self.postings.get(category)
+            return p.range(lo, hi).tolist() if p else []
+        out: List[int] = []
+        for p in self.postings.values():
+            out.extend(p.range(lo, hi))
+        return out
+
+
+# ---- full-text token index ---------------------------------------------------
+
+_TOKEN = re.compile(r"\w+")
+_BLOCK = 32
+# AND probes the next list block by block while it is this many times longer
+# than the surviving candidates; closer in size, it decodes the list outright.
+_PROBE_RATIO = 16
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def _put_varint(buf: bytearray, x: int) -> None:
+    while x > 0x7F:
+        buf.append((x & 0x7F) | 0x80)
+        x >>= 7
+    buf.append(x)
+
+
+def _gallop(a: array, x: int, lo: int) -> int:
+    # bisect_left(a, x, lo), probing lo+1, lo+3, lo+7, ... first, so a run of
+    # ascending lookups costs O(log gap) each rather than O(log n).
+    n = len(a)
+    step = 1
+    hi = lo
+    while hi < n and a[hi] < x:
+        lo = hi + 1
+        hi += step
+        step <<= 1
+    return bisect_left(a, x, lo, min(hi, n))
+
+
+class _TermPostings:
+    # Record ids containing one token, ascending, each with its term frequency.
+    # The ids live in blocks of _BLOCK (id delta, tf) varint pairs; `firsts`
+    # and `offsets` hold each block's first id and byte offset, so a lookup
+    # decodes one block. Ids past the last one are appended in place; other
+    # adds and all removes go to a small overlay (`extra`, `removed`) that is
+    # folded back in once it outgrows an eighth of the list.
+    def __init__(self):
+        self._reset()
+
+    def _reset(self) -> None:
+        self.data = bytearray()
+        self.firsts = array("q")
+        self.offsets = array("q")
+        self.n = 0
+        self.last = 0
+        self.tail = 0  # entries in the last block
+        self.extra: Dict[int, int] = {}
+        self.removed: Set[int] = set()
+
+    def __len__(self) -> int:
+        return self.n - len(self.removed) + len(self.extra)
+
+    def _append(self, rid: int, tf: int) -> None:
+        if not self.n or self.tail == _BLOCK:
+            self.firsts.append(rid)
+            self.offsets.append(len(self.data))
+            self.tail = 0
+            delta = 0
+        else:
+            delta = rid - self.last
+        _put_varint(self.data, delta)
+        _put_varint(self.data, tf)
+        self.last = rid
+        self.tail += 1
+        self.n += 1
+
+    def add(self, rid: int, tf: int) -> None:
+        if rid in self.removed or (self.n and rid <= self.last):
+            self.extra[rid] = tf
+            self._maybe_compact()
+        else:
+            self._append(rid, tf)
+
+    def extend(self, pairs: List[Tuple[int, int]]) -> None:
+        # pairs sorted by id
+        if self.n and pairs[0][0] <= self.last:
+            self.extra.update(pairs)
+            self._maybe_compact()
+        else:
+            for rid, tf in pairs:
+                self._append(rid, tf)
+
+    def remove(self, rid: int) -> None:
+        if self.extra.pop(rid, None) is None:
+            self.removed.add(rid)
+            self._maybe_compact()
+
+    def _maybe_compact(self) -> None:
+        if len(self.extra) + len(self.removed) > max(64, self.n >> 3):
+            self._rebuild(self.items())
+
+    def _rebuild(self, pairs: Iterable[Tuple[int, int]]) -> None:
+        pairs = list(pairs)
+        self._reset()
+        for rid, tf in pairs:
+            self._append(rid, tf)
+
+    def _block(self, b: int) -> Tuple[List[int], List[int]]:
+        data = self.data
+        i = self.offsets[b]
+        end = self.offsets[b + 1] if b + 1 < len(self.offsets) else len(data)
+        raw = data[i:end]
+        if max(raw) < 0x80:
+            # Every delta and tf fits in one byte (the common case for dense
+            # lists): decode in C.
+            deltas = raw[0::2]
+            ids = list(accumulate(deltas, initial=self.firsts[b]))
+            del ids[0]
+            return ids, list(raw[1::2])
+        ids: List[int] = []
+        tfs: List[int] = []
+        rid = self.firsts[b]
+        while i < end:
+            byte = data[i]
+            i += 1
+            v = byte & 0x7F
+            shift = 7
+            while byte & 0x80:
+                byte = data[i]
+                i += 1
+                v |= (byte & 0x7F) << shift
+                shift += 7
+            rid += v
+            byte = data[i]
+            i += 1
+            tf = byte & 0x7F
+            shift = 7
+            while byte & 0x80:
+                byte = data[i]
+                i += 1
+                tf |= (byte & 0x7F) << shift
+                shift += 7
+            ids.append(rid)
+            tfs.append(tf)
+        return ids, tfs
+
+    def _iter_main(self) -> Iterator[Tuple[int, int]]:
+        for b in range(len(self.firsts)):
+            ids, tfs = self._block(b)
+            yield from zip(ids, tfs)
+
+    def items(self) -> Iterator[Tuple[int, int]]:
+        # Live (id, tf) pairs in id order.
+        main = self._iter_main()
+        if self.removed:
+            removed = self.removed
+            main = ((rid, tf) for rid, tf in main if rid not in removed)
+        if self.extra:
+            return heapq.merge(main, sorted(self.extra.items()))
+        return main
+
+    def probe(self, ids: Iterable[int]) -> Iterator[Tuple[int, int]]:
+        # (id, tf) for each of the ascending `ids` that is present, found by
+        # galloping over the block index and then within the decoded block.
+        firsts, extra, removed = self.firsts, self.extra, self.removed
+        b = 0
+        cached = -1
+        block_ids: List[int] = []
+        block_tfs: List[int] = []
+        pos = 0
+        for rid in ids:
+            tf = extra.get(rid)
+            if tf is not None:
+                yield rid, tf
+                continue
+            b = _gallop(firsts, rid + 1, b) - 1
+            if b < 0:
+                b = 0
+                continue
+            if b != cached:
+                block_ids, block_tfs = self._block(b)
+                cached = b
+                pos = 0
+            pos = bisect_left(block_ids, rid, pos)
+            if pos < len(block_ids) and block_ids[pos] == rid and rid not in removed:
+                yield rid, block_tfs[pos]
+
+    def nbytes(self) -> int:
+        return len(self.data) + 8 * (len(self.firsts) + len(self.offsets))
+
+
+class TextIndex:
+    # Inverted index from lower-cased \w+ tokens of record text to id postings.
+    # AND queries walk the terms from rarest to most common, probing each
+    # next list only at the surviving ids; OR queries merge the lists.
+    # Scores are the summed term frequencies of the query tokens.
+    def __init__(self):
+        self.terms: Dict[str, _TermPostings] = {}
+
+    def add(self, rid: int, text: str) -> None:
+        for tok, tf in Counter(tokenize(text)).items():
+            p = self.terms.get(tok)
+            if p is None:
+                p = self.terms[tok] = _TermPostings()
+            p.add(rid, tf)
+
+    def add_many(self, rows: Iterable[Tuple[int, str]]) -> None:
+        grouped: Dict[str, List[Tuple[int, int]]] = {}
+        for rid, text in rows:
+            for tok, tf in Counter(tokenize(text)).items():
+                grouped.setdefault(tok, []).append((rid, tf))
+        for tok, pairs in grouped.items():
+            p = self.terms.get(tok)
+            if p is None:
+                p = self.terms[tok] = _TermPostings()
+            pairs.sort()
+            p.extend(pairs)
+
+    def remove(self, rid: int, text: str) -> None:
+        for tok in set(tokenize(text)):
+            p = self.terms.get(tok)
+            if p is None:
+                continue
+            p.remove(rid)
+            if not len(p):
+                del self.terms[tok]
+
+    def df(self, token: str) -> int:
+        p = self.terms.get(token.lower())
+        return len(p) if p else 0
+
+    def _postings(self, query: Iterable[str]) -> List[Optional[_TermPostings]]:
+        toks = dict.fromkeys(t for q in query for t in tokenize(q))
+        return [self.terms.get(t) for t in toks]
+
+    def _scores(self, query: Iterable[str], op: str) -> Iterable[Tuple[int, int]]:
+        lists = self._postings(query)
+        if op == "and":
+            if not lists or None in lists:
+                return []
+            lists.sort(key=len)
+            hits = list(lists[0].items())
+            for p in lists[1:]:
+                if not hits:
+                    break
+                if len(hits) * _PROBE_RATIO < len(p):
+                    tfs = dict(hits)
+                    hits = [(rid, tfs[rid] + tf) for rid, tf in p.probe(rid for rid, _ in hits)]
+                else:
+                    # Comparable sizes: decoding the whole list is cheaper than
+                    # a block probe per candidate.
+                    tfs = dict(p.items())
+                    hits = [(rid, tf + tfs[rid]) for rid, tf in hits if rid in tfs]
+            return hits
+        if op == "or":
+            scores: Dict[int, int] = {}
+            for p in lists:
+                if p is not None:
+                    for rid, tf in p.items():
+                        scores[rid] = scores.get(rid, 0) + tf
+            return sorted(scores.items())
+        raise ValueError(f"op must be 'and' or 'or', not {op!r}")
+
+    def search(self, query: Iterable[str], op: str = "and") -> List[int]:
+        # Ids of records matching all (op="and") or any (op="or") query tokens,
+        # ascending. Each query string may hold several tokens.
+        return [rid for rid, _ in self._scores(query, op)]
+
+    def top_k(self, query: Iterable[str], k: int = 10, op: str = "and") -> List[Tuple[int, int]]:
+        # (score, id) of the k best matches by summed term frequency; ties go
+        # to the lower id.
+        best = heapq.nsmallest(k, self._scores(query, op), key=lambda p: (-p[1], p[0]))
+        return [(tf, rid) for rid, tf in best]
+
+    def nbytes(self) -> int:
+        return sum(p.nbytes() for p in self.terms.values())
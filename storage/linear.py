@@ -1,4 +1,4 @@
-from typing import Any, Optional, List
+from typing import Any, Iterable, Optional, List
 from collections import deque
 
 class Array:
@@ -13,6 +13,7 @@ class DynamicArray:
     def __init__(self):
         self._data: List[Any] = []
     def append(self, x: Any) -> None: self._data.append(x)
+    def extend(self, xs: Iterable[Any]) -> None: self._data.extend(xs)
     def pop(self) -> Any: return self._data.pop()
     def __len__(self): return len(self._data)
     def __getitem__(self, i: int): return self._data[i]
@@ -86,10 +87,20 @@ class Stack:
     def __len__(self): return len(self._a)
 
 class Queue:
-    def __init__(self):
+    # With maxlen set, a full queue drops its oldest item on enqueue and counts it.
+    def __init__(self, maxlen: Optional[int] = None):
         self._q = deque()
-    def enqueue(self, x: Any) -> None: self._q.append(x)
+        self.maxlen = maxlen
+        self.dropped = 0
+    def enqueue(self, x: Any) -> None:
+        if self.maxlen is not None and len(self._q) >= self.maxlen:
+            self._q.popleft()
+            self.dropped += 1
+        self._q.append(x)
     def dequeue(self) -> Any: return self._q.popleft()
+    def dequeue_many(self, n: int) -> List[Any]:
+        q = self._q
+        return [q.popleft() for _ in range(min(n, len(q)))]
     def __len__(self): return len(self._q)
 
 class Deque:
@@ -99,5 +110,7 @@ class Deque:
     def push_back(self, x: Any) -> None: self._d.append(x)
     def pop_front(self) -> Any: return self._d.popleft()
     def pop_back(self) -> Any: return self._d.pop()
+    def peek_front(self) -> Any: return self._d[0]
+    def peek_back(self) -> Any: return self._d[-1]
     def __len__(self): return len(self._d)
     def to_list(self) -> List[Any]: return list(self._d)
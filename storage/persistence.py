@@ -0,0 +1,215 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Any, List, Optional, Tuple
+
+from models import Record
+from storage.columnar import ColumnStore
+
+# Snapshot layout: a fixed header followed by raw little-endian column
+# sections, each padded to 8 bytes so the file can be mmapped and sliced
+# straight into arrays without parsing. The header also carries the WAL
+# (generation, byte offset) the snapshot already covers, so a crash before
+# the WAL is rotated does not replay those entries a second time.
+SNAPSHOT_MAGIC = b"DASNAP02"
+_HEADER = struct.Struct("<8sQQQQIIQQ")
+_HEADER_V1 = (b"DASNAP01", struct.Struct("<8sQQQQII"))
+_NO_WAL = (1 << 64) - 1
+
+
+def _pad(n: int) -> int:
+    return (8 - n % 8) % 8
+
+
+def _write_section(f, data: bytes) -> None:
+    f.write(data)
+    f.write(b"\0" * _pad(len(data)))
+
+
+def _to_bytes(a: array) -> bytes:
+    if sys.byteorder != "little":
+        a = array(a.typecode, a)
+        a.byteswap()
+    return a.tobytes()
+
+
+def _from_bytes(typecode: str, data: Any) -> array:
+    a = array(typecode)
+    a.frombytes(data)
+    if sys.byteorder != "little":
+        a.byteswap()
+    return a
+
+
+def write_snapshot(path: str, store: ColumnStore, bloom_counts: Optional[List[int]] = None, bloom_k: int = 0,
+                   wal_mark: Optional[Tuple[int, int]] = None) -> None:
+    if store.dead:
+        raise ValueError("compact() the store before writing a snapshot")
+    n = len(store.ids)
+    cat_blob = bytearray()
+    cat_offsets = array("q", [0])
+    for name in store.cat_names:
+        cat_blob += name.encode("utf-8")
+        cat_offsets.append(len(cat_blob))
+    bloom = array("i", bloom_counts or [])
+    wal_gen, wal_pos = wal_mark or (_NO_WAL, 0)
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(SNAPSHOT_MAGIC, n, len(store.cat_names), len(cat_blob),
+                             len(store.text_blob), len(bloom), bloom_k, wal_gen, wal_pos))
+        _write_section(f, _to_bytes(store.ids))
+        _write_section(f, _to_bytes(store.vals))
+        _write_section(f, _to_bytes(store.cat_codes))
+        _write_section(f, _to_bytes(store.text_offsets))
+        _write_section(f, _to_bytes(cat_offsets))
+        _write_section(f, _to_bytes(bloom))
+        _write_section(f, bytes(cat_blob))
+        _write_section(f, bytes(store.text_blob))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def read_snapshot(path: str) -> Tuple[ColumnStore, List[int], int, Optional[Tuple[int, int]]]:
+    # The last item is the WAL mark passed to write_snapshot, or None when the
+    # snapshot predates WAL marks or was taken without a WAL.
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        if mm[:8] == SNAPSHOT_MAGIC:
+            magic, n, n_cats, cat_len, text_len, bloom_m, bloom_k, wal_gen, wal_pos = _HEADER.unpack_from(mm, 0)
+            pos = _HEADER.size
+        elif mm[:8] == _HEADER_V1[0]:
+            magic, n, n_cats, cat_len, text_len, bloom_m, bloom_k = _HEADER_V1[1].unpack_from(mm, 0)
+            wal_gen, wal_pos = _NO_WAL, 0
+            pos = _HEADER_V1[1].size
+        else:
+            raise ValueError(f"{path}: not a snapshot file")
+
+        def take(nbytes: int) -> memoryview:
+            nonlocal pos
+            view = memoryview(mm)[pos:pos + nbytes]
+            pos += nbytes + _pad(nbytes)
+            return view
+
+        store = ColumnStore()
+        store.ids = _from_bytes("q", take(8 * n))
+        store.vals = _from_bytes("q", take(8 * n))
+        store.cat_codes = _from_bytes("i", take(4 * n))
+        store.text_offsets = _from_bytes("q", take(8 * (n + 1)))
+        cat_offsets = _from_bytes("q", take(8 * (n_cats + 1)))
+        bloom = _from_bytes("i", take(4 * bloom_m)).tolist()
+        cat_blob = bytes(take(cat_len))
+        store.text_blob = bytearray(take(text_len))
+        store.alive = bytearray(b"\x01" * n)
+        for i in range(n_cats):
+            store.cat_names.append(cat_blob[cat_offsets[i]:cat_offsets[i + 1]].decode("utf-8"))
+        store.cat_lookup = {name: i for i, name in enumerate(store.cat_names)}
+    finally:
+        mm.close()
+    return store, bloom, bloom_k, None if wal_gen == _NO_WAL else (wal_gen, wal_pos)
+
+
+# WAL entries reuse the ("add", Record) / ("remove", id) tuples that the
+# undo stack already carries. The file starts with a generation number that
+# reset() bumps by rotating in a fresh file, so a snapshot's WAL mark tells
+# which entries it already holds.
+WAL_MAGIC = b"DAWAL001"
+_WAL_HEADER = struct.Struct("<8sQ")
+_WAL_ADD = struct.Struct("<cqqII")
+_WAL_REMOVE = struct.Struct("<cq")
+
+
+def _decode_wal(data: bytes, pos: int) -> Tuple[List[Tuple[str, Any]], int]:
+    ops: List[Tuple[str, Any]] = []
+    end = len(data)
+    while pos < end:
+        tag = data[pos:pos + 1]
+        if tag == b"A":
+            if pos + _WAL_ADD.size > end:
+                break
+            _, rid, value, cat_len, text_len = _WAL_ADD.unpack_from(data, pos)
+            body = pos + _WAL_ADD.size
+            if body + cat_len + text_len > end:
+                break
+            cat = data[body:body + cat_len].decode("utf-8")
+            text = data[body + cat_len:body + cat_len + text_len].decode("utf-8")
+            ops.append(("add", Record(rid, cat, value, text)))
+            pos = body + cat_len + text_len
+        elif tag == b"R":
+            if pos + _WAL_REMOVE.size > end:
+                break
+            _, rid = _WAL_REMOVE.unpack_from(data, pos)
+            ops.append(("remove", rid))
+            pos += _WAL_REMOVE.size
+        else:
+            raise ValueError(f"corrupt WAL entry at byte {pos}")
+    return ops, pos
+
+
+class WriteAheadLog:
+    def __init__(self, path: str, sync: bool = False):
+        self.path = path
+        self.sync = sync
+        self._f = open(path, "a+b")
+        self._f.seek(0)
+        head = self._f.read(_WAL_HEADER.size)
+        if not head:
+            self.generation = 0
+            self._f.write(_WAL_HEADER.pack(WAL_MAGIC, 0))
+            self.flush()
+        elif len(head) < _WAL_HEADER.size or head[:8] != WAL_MAGIC:
+            raise ValueError(f"{path}: not a WAL file")
+        else:
+            self.generation = _WAL_HEADER.unpack(head)[1]
+
+    def append(self, op: Tuple[str, Any]) -> None:
+        kind, arg = op
+        if kind == "add":
+            cat = arg.category.encode("utf-8")
+            text = arg.text.encode("utf-8")
+            self._f.write(_WAL_ADD.pack(b"A", arg.id, arg.value, len(cat), len(text)) + cat + text)
+        elif kind == "remove":
+            self._f.write(_WAL_REMOVE.pack(b"R", arg))
+        else:
+            raise ValueError(f"unknown WAL op {kind!r}")
+
+    def position(self) -> int:
+        self._f.flush()
+        return self._f.seek(0, os.SEEK_END)
+
+    def replay(self, start: int = 0) -> List[Tuple[str, Any]]:
+        # Entries from byte `start` on (a position() taken earlier in this
+        # generation). A torn final entry (crash mid-write) is dropped from the file.
+        self._f.flush()
+        self._f.seek(0)
+        data = self._f.read()
+        ops, valid = _decode_wal(data, max(start, _WAL_HEADER.size))
+        if valid < len(data):
+            self._f.truncate(valid)
+        return ops
+
+    def flush(self) -> None:
+        self._f.flush()
+        if self.sync:
+            os.fsync(self._f.fileno())
+
+    def reset(self) -> None:
+        # Swaps in an empty file of the next generation; os.replace keeps this
+        # atomic, so the log on disk is always either the old one or the new.
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_WAL_HEADER.pack(WAL_MAGIC, self.generation + 1))
+            f.flush()
+            os.fsync(f.fileno())
+        self._f.close()
+        os.replace(tmp, self.path)
+        self.generation += 1
+        self._f = open(self.path, "a+b")
+
+    def close(self) -> None:
+        self.flush()
+        self._f.close()
@@ -0,0 +1,88 @@
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+EAGER = "eager"
+LAZY = "lazy"
+DISABLED = "disabled"
+MODES = (EAGER, LAZY, DISABLED)
+
+
+class IndexSpec:
+    # add(ix, slot, record) / remove(ix, slot, record) keep a built index current;
+    # bulk(ix, start, end) loads a contiguous range of live slots from the store.
+    def __init__(self, name: str, factory: Callable[[], Any],
+                 add: Callable[[Any, int, Any], None],
+                 bulk: Callable[[Any, int, int], None],
+                 remove: Optional[Callable[[Any, int, Any], None]] = None,
+                 rebuild_on_compact: bool = False,
+                 mode: str = EAGER):
+        if mode not in MODES:
+            raise ValueError(f"unknown index mode {mode!r}")
+        self.name = name
+        self.factory = factory
+        self.add = add
+        self.bulk = bulk
+        self.remove = remove
+        self.rebuild_on_compact = rebuild_on_compact
+        self.mode = mode
+
+
+class IndexRegistry:
+    def __init__(self, extent: Callable[[], int]):
+        # extent() compacts the backing store and returns its slot count.
+        self._extent = extent
+        self.specs: Dict[str, IndexSpec] = {}
+        self.built: Dict[str, Any] = {}
+        self.build_seconds: Dict[str, float] = {}
+        self.active: List[Tuple[IndexSpec, Any]] = []
+        # Called as on_install(name, ix) whenever an index is (re)built or installed.
+        self.on_install: Optional[Callable[[str, Any], None]] = None
+
+    def register(self, spec: IndexSpec) -> None:
+        self.specs[spec.name] = spec
+        if spec.mode == EAGER:
+            self.build(spec.name)
+
+    def set_mode(self, name: str, mode: str) -> None:
+        if mode not in MODES:
+            raise ValueError(f"unknown index mode {mode!r}")
+        spec = self.specs[name]
+        spec.mode = mode
+        if mode == DISABLED:
+            self.drop(name)
+        elif mode == EAGER and name not in self.built:
+            self.build(name)
+
+    def get(self, name: str) -> Any:
+        ix = self.built.get(name)
+        if ix is not None:
+            return ix
+        spec = self.specs[name]
+        if spec.mode == DISABLED:
+            raise RuntimeError(f"index {name!r} is disabled")
+        return self.build(name)
+
+    def build(self, name: str) -> Any:
+        spec = self.specs[name]
+        t0 = time.perf_counter()
+        ix = spec.factory()
+        spec.bulk(ix, 0, self._extent())
+        self.build_seconds[name] = time.perf_counter() - t0
+        self.install(name, ix)
+        return ix
+
+    def install(self, name: str, ix: Any) -> None:
+        self.built[name] = ix
+        if self.on_install is not None:
+            self.on_install(name, ix)
+        self._refresh()
+
+    def drop(self, name: str) -> None:
+        self.built.pop(name, None)
+        self._refresh()
+
+    def is_built(self, name: str) -> bool:
+        return name in self.built
+
+    def _refresh(self) -> None:
+        self.active = [(self.specs[n], ix) for n, ix in self.built.items()]
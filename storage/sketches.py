@@ -0,0 +1,194 @@
+import heapq
+import math
+import random
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+class TopK:
+    # Size-k min-heap of (value, id): holds the k largest values seen so far.
+    def __init__(self, k: int = 10):
+        self.k = k
+        self.h: List[Tuple[int, int]] = []
+
+    def push(self, value: int, rid: int) -> None:
+        if len(self.h) < self.k:
+            heapq.heappush(self.h, (value, rid))
+        elif (value, rid) > self.h[0]:
+            heapq.heapreplace(self.h, (value, rid))
+
+    def merge(self, other: "TopK") -> None:
+        for value, rid in other.h:
+            self.push(value, rid)
+
+    def items(self) -> List[Tuple[int, int]]:
+        return sorted(self.h, reverse=True)
+
+    def __len__(self):
+        return len(self.h)
+
+
+class KLLSketch:
+    # KLL quantile sketch (Karnin, Lang, Liberty 2016). Level h holds items of
+    # weight 2**h; a full level is sorted and every other item (random offset)
+    # is promoted. With k=200 the rank error stays around 1% of n, and memory is
+    # bounded by roughly k / (1 - c) items however long the stream runs.
+    def __init__(self, k: int = 200, c: float = 2 / 3, seed: Optional[int] = None):
+        self.k = k
+        self.c = c
+        self.levels: List[List[Any]] = [[]]
+        self.n = 0
+        self.size = 0
+        self.min: Any = None
+        self.max: Any = None
+        self._rnd = random.Random(seed)
+        self._max_size = self._capacity(0)
+        self._cdf: Optional[Tuple[List[Any], List[int]]] = None
+
+    def _capacity(self, h: int) -> int:
+        depth = len(self.levels) - h - 1
+        return int(math.ceil(self.c ** depth * self.k)) + 1
+
+    def _refresh_max_size(self) -> None:
+        self._max_size = sum(self._capacity(h) for h in range(len(self.levels)))
+
+    def update(self, x: Any) -> None:
+        self.levels[0].append(x)
+        self._cdf = None
+        self.n += 1
+        self.size += 1
+        if self.min is None or x < self.min: self.min = x
+        if self.max is None or x > self.max: self.max = x
+        if self.size >= self._max_size:
+            self._compress()
+
+    def _compress(self) -> None:
+        for h in range(len(self.levels)):
+            level = self.levels[h]
+            if len(level) < self._capacity(h):
+                continue
+            if h + 1 == len(self.levels):
+                self.levels.append([])
+                self._refresh_max_size()
+            level.sort()
+            keep = level.pop() if len(level) % 2 else None
+            self.levels[h + 1].extend(level[self._rnd.randrange(2)::2])
+            self.levels[h] = [] if keep is None else [keep]
+            self.size = sum(len(l) for l in self.levels)
+            if self.size < self._max_size:
+                break
+
+    def merge(self, other: "KLLSketch") -> None:
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for h, level in enumerate(other.levels):
+            self.levels[h].extend(level)
+        self._cdf = None
+        self.n += other.n
+        self.size = sum(len(l) for l in self.levels)
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        self._refresh_max_size()
+        while self.size >= self._max_size:
+            self._compress()
+
+    def _weighted_cdf(self) -> Tuple[List[Any], List[int]]:
+        # Sorted items with cumulative weights, cached until the next write, so
+        # repeated queries cost a bisection each.
+        if self._cdf is None:
+            items = sorted((x, 1 << h) for h, level in enumerate(self.levels) for x in level)
+            xs = [x for x, _ in items]
+            cum = list(accumulate(w for _, w in items))
+            self._cdf = (xs, cum)
+        return self._cdf
+
+    def rank(self, x: Any) -> int:
+        xs, cum = self._weighted_cdf()
+        i = bisect_left(xs, x)
+        return cum[i - 1] if i else 0
+
+    def quantile(self, q: float) -> Any:
+        if not self.n:
+            raise ValueError("quantile of an empty sketch")
+        if q <= 0: return self.min
+        if q >= 1: return self.max
+        xs, cum = self._weighted_cdf()
+        i = bisect_right(cum, q * cum[-1])
+        return xs[min(i, len(xs) - 1)]
+
+    def quantiles(self, qs: Iterable[float]) -> List[Any]:
+        return [self.quantile(q) for q in qs]
+
+
+class CategorySketches:
+    # Per-category TopK + KLLSketch. Both are insert-only, so discard() only
+    # marks a category dirty; its next read rebuilds that one category from
+    # reload(category), which yields the (value, id) of its live rows.
+    # A store-wide TopK/KLL pair is fed alongside the per-category ones, so
+    # top_k(None)/sketch(None) need no merge; a discard drops it and the next
+    # global read rebuilds it once by merging the categories.
+    def __init__(self, k: int = 10, sketch_k: int = 200,
+                 reload: Optional[Callable[[str], Iterable[Tuple[int, int]]]] = None):
+        self.k = k
+        self.sketch_k = sketch_k
+        self.reload = reload
+        self.top: Dict[str, TopK] = {}
+        self.quant: Dict[str, KLLSketch] = {}
+        self.dirty: Set[str] = set()
+        self.all: Optional[Tuple[TopK, KLLSketch]] = (TopK(k), KLLSketch(sketch_k, seed=0))
+
+    def add(self, category: str, value: int, rid: int) -> None:
+        t = self.top.get(category)
+        if t is None:
+            t = self.top[category] = TopK(self.k)
+            self.quant[category] = KLLSketch(self.sketch_k, seed=len(self.quant))
+        t.push(value, rid)
+        self.quant[category].update(value)
+        if self.all is not None:
+            self.all[0].push(value, rid)
+            self.all[1].update(value)
+
+    def discard(self, category: str) -> None:
+        if self.reload is None:
+            raise RuntimeError("CategorySketches needs reload= to support discard")
+        self.dirty.add(category)
+        self.all = None
+
+    def _clean(self, category: Optional[str]) -> None:
+        stale = [category] if category is not None else list(self.dirty)
+        for c in stale:
+            if c not in self.dirty:
+                continue
+            self.dirty.discard(c)
+            self.top.pop(c, None)
+            self.quant.pop(c, None)
+            for value, rid in self.reload(c):
+                self.add(c, value, rid)
+
+    def top_k(self, category: Optional[str] = None) -> List[Tuple[int, int]]:
+        if self.dirty:
+            self._clean(category)
+        if category is not None:
+            t = self.top.get(category)
+            return t.items() if t else []
+        return self._all()[0].items()
+
+    def sketch(self, category: Optional[str] = None) -> Optional[KLLSketch]:
+        if self.dirty:
+            self._clean(category)
+        if category is not None:
+            return self.quant.get(category)
+        merged = self._all()[1]
+        return merged if merged.n else None
+
+    def _all(self) -> Tuple[TopK, KLLSketch]:
+        if self.all is None:
+            top, quant = TopK(self.k), KLLSketch(self.sketch_k, seed=0)
+            for t in self.top.values():
+                top.merge(t)
+            for q in self.quant.values():
+                quant.merge(q)
+            self.all = (top, quant)
+        return self.all
@@ -0,0 +1,105 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from itertools import chain
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+from algorithms.searching import search_many
+
+
+class SortedIndex:
+    # Sorted int64 values for repeated lower/upper-bound and range queries.
+    # Writes land in pending buffers and are merged on the next read: one
+    # Timsort pass over the sorted array plus the sorted batch, so a bulk load
+    # or a stream of adds costs O(n + k log k) per read instead of an O(n)
+    # insert each.
+    def __init__(self, values: Iterable[int] = ()):
+        self.keys = array("q", sorted(values))
+        self.pending = array("q")
+        self.removed: Counter = Counter()
+
+    def add(self, value: int) -> None:
+        self.pending.append(value)
+
+    def add_many(self, values: Iterable[int]) -> None:
+        self.pending.extend(values)
+
+    def remove(self, value: int) -> None:
+        # One copy of value; call only for values that are present.
+        self.removed[value] += 1
+
+    def _merge(self) -> array:
+        if self.pending:
+            self.keys = array("q", sorted(chain(self.keys, self.pending)))
+            self.pending = array("q")
+        if self.removed:
+            removed = self.removed
+            keys = self.keys
+            # One pass: copy the stretches between removed values and skip up
+            # to removed[v] copies of each, O(n + r log n) for r distinct values.
+            kept = array("q")
+            pos = 0
+            for v in sorted(removed):
+                i = bisect_left(keys, v, pos)
+                kept.extend(keys[pos:i])
+                pos = min(i + removed[v], bisect_right(keys, v, i))
+            kept.extend(keys[pos:])
+            self.keys = kept
+            self.removed = Counter()
+        return self.keys
+
+    def column(self) -> array:
+        # The sorted keys, for bulk readers (search_many, NumPy views).
+        return self._merge()
+
+    def __len__(self) -> int:
+        return len(self._merge())
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._merge())
+
+    def __getitem__(self, i: int) -> int:
+        return self._merge()[i]
+
+    def __contains__(self, value: int) -> bool:
+        keys = self._merge()
+        i = bisect_left(keys, value)
+        return i < len(keys) and keys[i] == value
+
+    def __repr__(self):
+        return repr(self.tolist())
+
+    def tolist(self) -> List[int]:
+        return self._merge().tolist()
+
+    def lower_bound(self, value: int) -> int:
+        return bisect_left(self._merge(), value)
+
+    def upper_bound(self, value: int) -> int:
+        return bisect_right(self._merge(), value)
+
+    def find(self, value: int) -> int:
+        # Position of the first copy of value, or -1.
+        keys = self._merge()
+        i = bisect_left(keys, value)
+        return i if i < len(keys) and keys[i] == value else -1
+
+    def count(self, value: int) -> int:
+        keys = self._merge()
+        return bisect_right(keys, value) - bisect_left(keys, value)
+
+    def range(self, lo: Optional[int] = None, hi: Optional[int] = None) -> array:
+        # Values in [lo, hi], either end open when None.
+        keys = self._merge()
+        i = 0 if lo is None else bisect_left(keys, lo)
+        j = len(keys) if hi is None else bisect_right(keys, hi)
+        return keys[i:j]
+
+    def count_range(self, lo: Optional[int] = None, hi: Optional[int] = None) -> int:
+        keys = self._merge()
+        i = 0 if lo is None else bisect_left(keys, lo)
+        j = len(keys) if hi is None else bisect_right(keys, hi)
+        return j - i
+
+    def search_many(self, queries: Sequence[int], side: str = "left") -> List[int]:
+        return search_many(self._merge(), queries, side)
@@ -1,5 +1,6 @@
-from typing import List
+from typing import Iterable, List
 import hashlib
+from collections import Counter
 
 class DSU:
     def __init__(self, n: int):
@@ -32,12 +33,26 @@ class BloomFilter:
             h = hashlib.sha256((str(i) + s).encode()).hexdigest()
             yield int(h, 16) % self.m
 
+    # bits holds counters rather than 0/1 so that remove() can undo an add().
     def add(self, s: str) -> None:
         for h in self._hashes(s):
-            self.bits[h] = 1
+            self.bits[h] += 1
+
+    def add_many(self, items: Iterable[str]) -> None:
+        bits = self.bits
+        for s, c in Counter(items).items():
+            for h in self._hashes(s):
+                bits[h] += c
+
+    def remove(self, s: str) -> None:
+        hs = list(self._hashes(s))
+        if not all(self.bits[h] > 0 for h in hs):
+            return
+        for h in hs:
+            self.bits[h] -= 1
 
     def might_contain(self, s: str) -> bool:
-        return all(self.bits[h] == 1 for h in self._hashes(s))
+        return all(self.bits[h] > 0 for h in self._hashes(s))
 
 class SegmentTree:
     def __init__(self, a: List[int]):
@@ -1,4 +1,7 @@
-from typing import Any, Optional, List, Dict
+from heapq import merge
+from itertools import groupby, islice, repeat
+from operator import attrgetter, itemgetter, lt
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 class BinaryNode:
     def __init__(self, key: Any, left: Optional["BinaryNode"]=None, right: Optional["BinaryNode"]=None):
@@ -6,38 +9,163 @@ class BinaryNode:
         self.left = left
         self.right = right
 
+# Traversals walk an explicit stack of at most height nodes, so skewed trees
+# cost O(n) time and O(height) memory and never hit the recursion limit.
+def _walk(root: Any, lo: Any = None, hi: Any = None) -> Iterator[Any]:
+    # Nodes in key order, skipping subtrees wholly outside [lo, hi] (None = open).
+    stack = []
+    n = root
+    while True:
+        while n:
+            if lo is not None and n.key < lo:
+                n = n.right
+            else:
+                stack.append(n)
+                n = n.left
+        if not stack:
+            return
+        n = stack.pop()
+        if hi is not None and n.key > hi:
+            return
+        yield n
+        n = n.right
+
+def _walk_reversed(root: Any, lo: Any = None, hi: Any = None) -> Iterator[Any]:
+    stack = []
+    n = root
+    while True:
+        while n:
+            if hi is not None and n.key > hi:
+                n = n.left
+            else:
+                stack.append(n)
+                n = n.right
+        if not stack:
+            return
+        n = stack.pop()
+        if lo is not None and n.key < lo:
+            return
+        yield n
+        n = n.left
+
+def _pre(root: Any, first: Callable[[Any], Any], second: Callable[[Any], Any]) -> Iterator[Any]:
+    stack = [root] if root else []
+    while stack:
+        n = stack.pop()
+        yield n
+        if second(n):
+            stack.append(second(n))
+        if first(n):
+            stack.append(first(n))
+
+def _post(root: Any, first: Callable[[Any], Any], second: Callable[[Any], Any]) -> Iterator[Any]:
+    stack = []
+    n, last = root, None
+    while stack or n:
+        if n:
+            stack.append(n)
+            n = first(n)
+        else:
+            top = stack[-1]
+            nxt = second(top)
+            if nxt and nxt is not last:
+                n = nxt
+            else:
+                last = stack.pop()
+                yield last
+
+_left = attrgetter("left")
+_right = attrgetter("right")
+
+# reverse=True yields the same sequence back to front: reversed preorder is
+# the mirror image's postorder and vice versa.
+def iter_preorder(root: Optional[BinaryNode], reverse: bool = False) -> Iterator[Any]:
+    nodes = _post(root, _right, _left) if reverse else _pre(root, _left, _right)
+    return (n.key for n in nodes)
+
+def iter_inorder(root: Optional[BinaryNode], reverse: bool = False) -> Iterator[Any]:
+    return (n.key for n in (_walk_reversed(root) if reverse else _walk(root)))
+
+def iter_postorder(root: Optional[BinaryNode], reverse: bool = False) -> Iterator[Any]:
+    nodes = _pre(root, _right, _left) if reverse else _post(root, _left, _right)
+    return (n.key for n in nodes)
+
 def preorder(root: Optional[BinaryNode]) -> List[Any]:
-    if not root: return []
-    return [root.key] + preorder(root.left) + preorder(root.right)
+    return list(iter_preorder(root))
 
 def inorder(root: Optional[BinaryNode]) -> List[Any]:
-    if not root: return []
-    return inorder(root.left) + [root.key] + inorder(root.right)
+    return list(iter_inorder(root))
 
 def postorder(root: Optional[BinaryNode]) -> List[Any]:
-    if not root: return []
-    return postorder(root.left) + postorder(root.right) + [root.key]
+    return list(iter_postorder(root))
+
+def height(root: Any) -> int:
+    # Levels in any left/right tree, counted breadth-first (no recursion limit).
+    h = 0
+    level = [root] if root else []
+    while level:
+        h += 1
+        level = [c for n in level for c in (n.left, n.right) if c]
+    return h
+
+class _Ordered:
+    # Key-order iteration shared by BST, AVL and RedBlackTree; a node holding
+    # cnt copies of its key yields it cnt times.
+    root: Any
+
+    def __iter__(self) -> Iterator[Any]:
+        return self._keys(_walk(self.root))
+
+    def __reversed__(self) -> Iterator[Any]:
+        return self._keys(_walk_reversed(self.root))
+
+    def iter_range(self, lo: Any = None, hi: Any = None, reverse: bool = False) -> Iterator[Any]:
+        # Keys in [lo, hi] (either end open when None), visiting only the
+        # subtrees that overlap it: O(height + matches).
+        return self._keys((_walk_reversed if reverse else _walk)(self.root, lo, hi))
+
+    @staticmethod
+    def _keys(nodes: Iterator[Any]) -> Iterator[Any]:
+        for n in nodes:
+            if n.cnt == 1:
+                yield n.key
+            else:
+                yield from repeat(n.key, n.cnt)
+
+    def inorder_list(self) -> List[Any]:
+        return list(self)
 
 class BSTNode:
+    cnt = 1  # BST keys are unique
+
     def __init__(self, key: Any):
         self.key = key
         self.left: Optional["BSTNode"] = None
         self.right: Optional["BSTNode"] = None
 
-class BST:
+class BST(_Ordered):
     def __init__(self):
         self.root: Optional[BSTNode] = None
 
     def insert(self, key: Any) -> None:
-        def _ins(node: Optional[BSTNode], k: Any) -> BSTNode:
-            if not node:
-                return BSTNode(k)
-            if k < node.key:
-                node.left = _ins(node.left, k)
-            elif k > node.key:
-                node.right = _ins(node.right, k)
-            return node
-        self.root = _ins(self.root, key)
+        # Iterative, like search: a BST fed sorted keys is as deep as it is long.
+        if not self.root:
+            self.root = BSTNode(key)
+            return
+        cur = self.root
+        while True:
+            if key < cur.key:
+                if not cur.left:
+                    cur.left = BSTNode(key)
+                    return
+                cur = cur.left
+            elif key > cur.key:
+                if not cur.right:
+                    cur.right = BSTNode(key)
+                    return
+                cur = cur.right
+            else:
+                return
 
     def search(self, key: Any) -> bool:
         cur = self.root
@@ -47,47 +175,165 @@ class BST:
         return False
 
     def delete(self, key: Any) -> None:
-        def _min_node(n: BSTNode) -> BSTNode:
-            while n.left:
+        parent, node = None, self.root
+        while node and node.key != key:
+            parent, node = node, node.left if key < node.key else node.right
+        if not node:
+            return
+        if node.left and node.right:
+            # Take the successor's key, then unlink the successor instead.
+            parent, succ = node, node.right
+            while succ.left:
+                parent, succ = succ, succ.left
+            node.key = succ.key
+            node = succ
+        child = node.left or node.right
+        if not parent:
+            self.root = child
+        elif parent.left is node:
+            parent.left = child
+        else:
+            parent.right = child
+
+# AVL and red-black nodes carry cnt (copies of key), size (elements in the
+# subtree, duplicates included) and total (sum of those elements), which is
+# what rank/select/count_range/sum_range walk down.
+def _size(n: Any) -> int:
+    return n.size if n else 0
+
+def _total(n: Any) -> Any:
+    return n.total if n else 0
+
+def _weight(n: Any) -> Any:
+    # What n's copies add to total; non-numeric keys add 0, so sum_range over
+    # them is 0.
+    return n.key * n.cnt if isinstance(n.key, (int, float)) else 0
+
+def _pull(n: Any) -> None:
+    l, r = n.left, n.right
+    n.size = n.cnt + (l.size if l else 0) + (r.size if r else 0)
+    n.total = _weight(n) + (l.total if l else 0) + (r.total if r else 0)
+
+def _count_below(n: Any, x: Any, inclusive: bool) -> int:
+    out = 0
+    while n:
+        if x < n.key or (x == n.key and not inclusive):
+            n = n.left
+        else:
+            out += _size(n.left) + (n.cnt if x > n.key or inclusive else 0)
+            n = n.right
+    return out
+
+def _sum_below(n: Any, x: Any, inclusive: bool) -> Any:
+    out = 0
+    while n:
+        if x < n.key or (x == n.key and not inclusive):
+            n = n.left
+        else:
+            out += _total(n.left) + _weight(n)
+            n = n.right
+    return out
+
+def _runs(keys: Iterable[Any]) -> List[Tuple[Any, int]]:
+    # (key, copies) for an ascending iterable of keys.
+    keys = list(keys)
+    if all(map(lt, keys, islice(keys, 1, None))):
+        return list(zip(keys, repeat(1)))
+    runs = [(k, sum(1 for _ in g)) for k, g in groupby(keys)]
+    for (a, _), (b, _) in zip(runs, runs[1:]):
+        if not a < b:
+            raise ValueError("keys are not sorted")
+    return runs
+
+def _merge_runs(a: Iterable[Tuple[Any, int]], b: Iterable[Tuple[Any, int]]) -> List[Tuple[Any, int]]:
+    out: List[Tuple[Any, int]] = []
+    for k, c in merge(a, b, key=itemgetter(0)):
+        if out and out[-1][0] == k:
+            out[-1] = (k, out[-1][1] + c)
+        else:
+            out.append((k, c))
+    return out
+
+class _OrderStatistics(_Ordered):
+    root: Any
+
+    # Bulk loads build the tree from sorted (key, count) runs by repeatedly
+    # taking the middle run as the subtree root: O(n), with every leaf on
+    # the last two levels. Each subclass sets _builder(runs) -> root.
+    _builder: Callable[[List[Tuple[Any, int]]], Any]
+
+    @classmethod
+    def from_sorted(cls, keys: Iterable[Any]):
+        # Tree holding keys, which must be ascending (duplicates allowed).
+        tree = cls()
+        tree.root = tree._builder(_runs(keys))
+        return tree
+
+    def bulk_insert(self, keys: Iterable[Any]) -> None:
+        # Batches up to about 3n / log2(n) keys go in one insert at a time
+        # (an insert costs a few node builds per level); larger ones are
+        # merged with the current keys and rebuilt in O(n + k log k).
+        batch = _runs(sorted(keys))
+        n = _size(self.root)
+        if len(batch) * n.bit_length() < 3 * n:
+            for k, c in batch:
+                self.insert(k, c)
+            return
+        current = ((node.key, node.cnt) for node in _walk(self.root))
+        self.root = self._builder(_merge_runs(current, batch))
+
+    def __len__(self) -> int:
+        return _size(self.root)
+
+    def rank(self, x: Any) -> int:
+        return _count_below(self.root, x, False)
+
+    def select(self, k: int) -> Any:
+        if not 0 <= k < _size(self.root):
+            raise IndexError("select index out of range")
+        n = self.root
+        while n:
+            ls = _size(n.left)
+            if k < ls:
                 n = n.left
-            return n
-
-        def _del(node: Optional[BSTNode], k: Any) -> Optional[BSTNode]:
-            if not node:
-                return None
-            if k < node.key:
-                node.left = _del(node.left, k)
-            elif k > node.key:
-                node.right = _del(node.right, k)
+            elif k < ls + n.cnt:
+                return n.key
             else:
-                if not node.left:
-                    return node.right
-                if not node.right:
-                    return node.left
-                succ = _min_node(node.right)
-                node.key = succ.key
-                node.right = _del(node.right, succ.key)
-            return node
-        self.root = _del(self.root, key)
-
-    def inorder_list(self) -> List[Any]:
-        def _in(n: Optional[BSTNode]) -> List[Any]:
-            if not n: return []
-            return _in(n.left) + [n.key] + _in(n.right)
-        return _in(self.root)
+                k -= ls + n.cnt
+                n = n.right
+
+    def count(self, x: Any) -> int:
+        n = self.root
+        while n:
+            if x == n.key: return n.cnt
+            n = n.left if x < n.key else n.right
+        return 0
+
+    def count_range(self, lo: Any, hi: Any) -> int:
+        if hi < lo:
+            return 0
+        return _count_below(self.root, hi, True) - _count_below(self.root, lo, False)
+
+    def sum_range(self, lo: Any, hi: Any) -> Any:
+        if hi < lo:
+            return 0
+        return _sum_below(self.root, hi, True) - _sum_below(self.root, lo, False)
 
 class AVLNode:
-    def __init__(self, key: Any):
+    def __init__(self, key: Any, cnt: int = 1):
         self.key = key
         self.left: Optional["AVLNode"] = None
         self.right: Optional["AVLNode"] = None
         self.h = 1
+        self.cnt = cnt
+        _pull(self)
 
 def _h(n: Optional[AVLNode]) -> int:
     return n.h if n else 0
 
 def _upd(n: AVLNode) -> None:
     n.h = 1 + max(_h(n.left), _h(n.right))
+    _pull(n)
 
 def _bf(n: AVLNode) -> int:
     return _h(n.left) - _h(n.right)
@@ -108,19 +354,51 @@ def _rot_left(x: AVLNode) -> AVLNode:
     _upd(x); _upd(y)
     return y
 
-class AVL:
+def _rebalance(n: AVLNode) -> AVLNode:
+    _upd(n)
+    bal = _bf(n)
+    if bal > 1:
+        if _bf(n.left) < 0:
+            n.left = _rot_left(n.left)
+        return _rot_right(n)
+    if bal < -1:
+        if _bf(n.right) > 0:
+            n.right = _rot_right(n.right)
+        return _rot_left(n)
+    return n
+
+def _build_avl(runs: List[Tuple[Any, int]], lo: int, hi: int) -> Optional[AVLNode]:
+    if lo >= hi:
+        return None
+    mid = (lo + hi) // 2
+    n = AVLNode(*runs[mid])
+    if hi - lo > 1:
+        n.left = _build_avl(runs, lo, mid)
+        n.right = _build_avl(runs, mid + 1, hi)
+        n.h = (hi - lo).bit_length()
+        _pull(n)
+    return n
+
+def _avl_from_runs(runs: List[Tuple[Any, int]]) -> Optional[AVLNode]:
+    return _build_avl(runs, 0, len(runs))
+
+class AVL(_OrderStatistics):
+    _builder = staticmethod(_avl_from_runs)
+
     def __init__(self):
         self.root: Optional[AVLNode] = None
 
-    def insert(self, key: Any) -> None:
+    def insert(self, key: Any, count: int = 1) -> None:
         def _ins(n: Optional[AVLNode], k: Any) -> AVLNode:
             if not n:
-                return AVLNode(k)
+                return AVLNode(k, count)
             if k < n.key:
                 n.left = _ins(n.left, k)
             elif k > n.key:
                 n.right = _ins(n.right, k)
             else:
+                n.cnt += count
+                _pull(n)
                 return n
             _upd(n)
             bal = _bf(n)
@@ -137,24 +415,72 @@ class AVL:
             return n
         self.root = _ins(self.root, key)
 
-    def inorder_list(self) -> List[Any]:
-        def _in(n: Optional[AVLNode]) -> List[Any]:
-            if not n: return []
-            return _in(n.left) + [n.key] + _in(n.right)
-        return _in(self.root)
+    def search(self, key: Any) -> bool:
+        cur = self.root
+        while cur:
+            if key == cur.key: return True
+            cur = cur.left if key < cur.key else cur.right
+        return False
+
+    def delete(self, key: Any) -> None:
+        # Removes one copy of key; the node goes once its count reaches zero.
+        def _del(n: Optional[AVLNode], k: Any, whole: bool) -> Optional[AVLNode]:
+            if not n:
+                return None
+            if k < n.key:
+                n.left = _del(n.left, k, whole)
+            elif k > n.key:
+                n.right = _del(n.right, k, whole)
+            elif n.cnt > 1 and not whole:
+                n.cnt -= 1
+            else:
+                if not n.left:
+                    return n.right
+                if not n.right:
+                    return n.left
+                succ = n.right
+                while succ.left:
+                    succ = succ.left
+                n.key, n.cnt = succ.key, succ.cnt
+                n.right = _del(n.right, succ.key, True)
+            return _rebalance(n)
+        self.root = _del(self.root, key, False)
 
 RED = 1
 BLACK = 0
 
 class RBNode:
-    def __init__(self, key: Any, color: int = RED):
+    def __init__(self, key: Any, color: int = RED, cnt: int = 1):
         self.key = key
         self.color = color
         self.left: Optional["RBNode"] = None
         self.right: Optional["RBNode"] = None
         self.parent: Optional["RBNode"] = None
+        self.cnt = cnt
+        _pull(self)
+
+def _build_rb(runs: List[Tuple[Any, int]], lo: int, hi: int, depth: int, red: int,
+              parent: Optional[RBNode]) -> Optional[RBNode]:
+    if lo >= hi:
+        return None
+    mid = (lo + hi) // 2
+    k, c = runs[mid]
+    n = RBNode(k, RED if depth == red else BLACK, c)
+    n.parent = parent
+    if hi - lo > 1:
+        n.left = _build_rb(runs, lo, mid, depth + 1, red, n)
+        n.right = _build_rb(runs, mid + 1, hi, depth + 1, red, n)
+        _pull(n)
+    return n
+
+def _rb_from_runs(runs: List[Tuple[Any, int]]) -> Optional[RBNode]:
+    # Levels 0..d-1 are full, where d = floor(log2(n + 1)); colouring only
+    # the partial level d red gives every path d black nodes.
+    return _build_rb(runs, 0, len(runs), 0, (len(runs) + 1).bit_length() - 1, None)
+
+class RedBlackTree(_OrderStatistics):
+    _builder = staticmethod(_rb_from_runs)
 
-class RedBlackTree:
     def __init__(self):
         self.root: Optional[RBNode] = None
 
@@ -173,6 +499,7 @@ class RedBlackTree:
             x.parent.right = y
         y.left = x
         x.parent = y
+        _pull(x); _pull(y)
 
     def _rotate_right(self, y: RBNode) -> None:
         x = y.left
@@ -189,19 +516,22 @@ class RedBlackTree:
             y.parent.right = x
         x.right = y
         y.parent = x
+        _pull(y); _pull(x)
 
-    def insert(self, key: Any) -> None:
-        node = RBNode(key, RED)
+    def insert(self, key: Any, count: int = 1) -> None:
         y = None
         x = self.root
         while x:
             y = x
-            if node.key < x.key:
+            if key < x.key:
                 x = x.left
-            elif node.key > x.key:
+            elif key > x.key:
                 x = x.right
             else:
+                x.cnt += count
+                self._pull_up(x)
                 return
+        node = RBNode(key, RED, count)
         node.parent = y
         if not y:
             self.root = node
@@ -209,8 +539,14 @@ class RedBlackTree:
             y.left = node
         else:
             y.right = node
+        self._pull_up(y)
         self._fix_insert(node)
 
+    def _pull_up(self, n: Optional[RBNode]) -> None:
+        while n:
+            _pull(n)
+            n = n.parent
+
     def _fix_insert(self, z: RBNode) -> None:
         while z.parent and z.parent.color == RED:
             gp = z.parent.parent
@@ -254,16 +590,109 @@ class RedBlackTree:
             cur = cur.left if key < cur.key else cur.right
         return False
 
-    def inorder_list(self) -> List[Any]:
-        def _in(n: Optional[RBNode]) -> List[Any]:
-            if not n: return []
-            return _in(n.left) + [n.key] + _in(n.right)
-        return _in(self.root)
+    def _transplant(self, u: RBNode, v: Optional[RBNode]) -> None:
+        if not u.parent:
+            self.root = v
+        elif u is u.parent.left:
+            u.parent.left = v
+        else:
+            u.parent.right = v
+        if v:
+            v.parent = u.parent
+
+    def delete(self, key: Any) -> None:
+        # Removes one copy of key; the node goes once its count reaches zero.
+        z = self.root
+        while z and z.key != key:
+            z = z.left if key < z.key else z.right
+        if not z:
+            return
+        if z.cnt > 1:
+            z.cnt -= 1
+            self._pull_up(z)
+            return
+        y_color = z.color
+        if not z.left:
+            x, x_parent = z.right, z.parent
+            self._transplant(z, z.right)
+        elif not z.right:
+            x, x_parent = z.left, z.parent
+            self._transplant(z, z.left)
+        else:
+            y = z.right
+            while y.left:
+                y = y.left
+            y_color = y.color
+            x = y.right
+            if y.parent is z:
+                x_parent = y
+            else:
+                x_parent = y.parent
+                self._transplant(y, y.right)
+                y.right = z.right
+                y.right.parent = y
+            self._transplant(z, y)
+            y.left = z.left
+            y.left.parent = y
+            y.color = z.color
+        self._pull_up(x_parent)
+        if y_color == BLACK:
+            self._fix_delete(x, x_parent)
+
+    def _fix_delete(self, x: Optional[RBNode], parent: Optional[RBNode]) -> None:
+        # x may be None (a black leaf), so its parent is tracked separately.
+        while x is not self.root and (not x or x.color == BLACK) and parent:
+            if x is parent.left:
+                w = parent.right
+                if w.color == RED:
+                    w.color = BLACK
+                    parent.color = RED
+                    self._rotate_left(parent)
+                    w = parent.right
+                if (not w.left or w.left.color == BLACK) and (not w.right or w.right.color == BLACK):
+                    w.color = RED
+                    x, parent = parent, parent.parent
+                else:
+                    if not w.right or w.right.color == BLACK:
+                        w.left.color = BLACK
+                        w.color = RED
+                        self._rotate_right(w)
+                        w = parent.right
+                    w.color = parent.color
+                    parent.color = BLACK
+                    w.right.color = BLACK
+                    self._rotate_left(parent)
+                    x = self.root
+                    break
+            else:
+                w = parent.left
+                if w.color == RED:
+                    w.color = BLACK
+                    parent.color = RED
+                    self._rotate_right(parent)
+                    w = parent.left
+                if (not w.left or w.left.color == BLACK) and (not w.right or w.right.color == BLACK):
+                    w.color = RED
+                    x, parent = parent, parent.parent
+                else:
+                    if not w.left or w.left.color == BLACK:
+                        w.right.color = BLACK
+                        w.color = RED
+                        self._rotate_left(w)
+                        w = parent.left
+                    w.color = parent.color
+                    parent.color = BLACK
+                    w.left.color = BLACK
+                    self._rotate_right(parent)
+                    x = self.root
+                    break
+        if x:
+            x.color = BLACK
 
 class TrieNode:
     def __init__(self):
         self.children: Dict[str, "TrieNode"] = {}
-        self.end = False
+        self.count = 0
 
 class Trie:
     def __init__(self):
@@ -275,7 +704,26 @@ class Trie:
             if ch not in cur.children:
                 cur.children[ch] = TrieNode()
             cur = cur.children[ch]
-        cur.end = True
+        cur.count += 1
+
+    def delete(self, word: str) -> bool:
+        path = []
+        cur = self.root
+        for ch in word:
+            nxt = cur.children.get(ch)
+            if not nxt:
+                return False
+            path.append((cur, ch))
+            cur = nxt
+        if not cur.count:
+            return False
+        cur.count -= 1
+        for parent, ch in reversed(path):
+            node = parent.children[ch]
+            if node.count or node.children:
+                break
+            del parent.children[ch]
+        return True
 
     def starts_with(self, prefix: str) -> List[str]:
         cur = self.root
@@ -285,7 +733,7 @@ class Trie:
             cur = cur.children[ch]
         out: List[str] = []
         def _dfs(node: TrieNode, path: str):
-            if node.end:
+            if node.count:
                 out.append(path)
             for c, nxt in node.children.items():
                 _dfs(nxt, path + c)
@@ -295,6 +743,8 @@ class Trie:
 class MinHeap:
     def __init__(self):
         self.a = []
+        self._gone: Dict[Any, int] = {}
+        self._pending = 0
 
     def push(self, x):
         self.a.append(x)
@@ -307,40 +757,73 @@ class MinHeap:
             i = p
 
     def pop(self):
+        self._prune()
         if not self.a:
             raise IndexError("pop from empty heap")
         top = self.a[0]
         last = self.a.pop()
         if self.a:
             self.a[0] = last
-            i = 0
-            n = len(self.a)
-            while True:
-                l = 2 * i + 1
-                r = 2 * i + 2
-                m = i
-                if l < n and self.a[l] < self.a[m]:
-                    m = l
-                if r < n and self.a[r] < self.a[m]:
-                    m = r
-                if m == i:
-                    break
-                self.a[i], self.a[m] = self.a[m], self.a[i]
-                i = m
+            self._sift_down(0)
         return top
 
+    def _sift_down(self, i):
+        n = len(self.a)
+        while True:
+            l = 2 * i + 1
+            r = 2 * i + 2
+            m = i
+            if l < n and self.a[l] < self.a[m]:
+                m = l
+            if r < n and self.a[r] < self.a[m]:
+                m = r
+            if m == i:
+                break
+            self.a[i], self.a[m] = self.a[m], self.a[i]
+            i = m
+
+    def push_many(self, xs):
+        xs = list(xs)
+        if len(xs) < len(self.a):
+            for x in xs:
+                self.push(x)
+            return
+        self.a.extend(xs)
+        for i in range(len(self.a) // 2 - 1, -1, -1):
+            self._sift_down(i)
+
     def peek(self):
+        self._prune()
         if not self.a:
             raise IndexError("peek from empty heap")
         return self.a[0]
 
+    def discard(self, x):
+        # Lazy delete: x is dropped once it surfaces at the top.
+        self._gone[x] = self._gone.get(x, 0) + 1
+        self._pending += 1
+
+    def _prune(self):
+        while self._pending and self.a and self._gone.get(self.a[0]):
+            x = self.a[0]
+            self._gone[x] -= 1
+            if not self._gone[x]:
+                del self._gone[x]
+            self._pending -= 1
+            last = self.a.pop()
+            if self.a:
+                self.a[0] = last
+                self._sift_down(0)
+
     def __len__(self):
-        return len(self.a)
+        return len(self.a) - self._pending
 
 
 class MaxHeap:
     def __init__(self):
         self.a = []
+        self._gone: Dict[Any, int] = {}
+        self._pending = 0
 
     def push(self, x):
         self.a.append(x)
@@ -353,32 +836,63 @@ class MaxHeap:
             i = p
 
     def pop(self):
+        self._prune()
         if not self.a:
             raise IndexError("pop from empty heap")
         top = self.a[0]
         last = self.a.pop()
         if self.a:
             self.a[0] = last
-            i = 0
-            n = len(self.a)
-            while True:
-                l = 2 * i + 1
-                r = 2 * i + 2
-                m = i
-                if l < n and self.a[l] > self.a[m]:
-                    m = l
-                if r < n and self.a[r] > self.a[m]:
-                    m = r
-                if m == i:
-                    break
-                self.a[i], self.a[m] = self.a[m], self.a[i]
-                i = m
+            self._sift_down(0)
         return top
 
+    def _sift_down(self, i):
+        n = len(self.a)
+        while True:
+            l = 2 * i + 1
+            r = 2 * i + 2
+            m = i
+            if l < n and self.a[l] > self.a[m]:
+                m = l
+            if r < n and self.a[r] > self.a[m]:
+                m = r
+            if m == i:
+                break
+            self.a[i], self.a[m] = self.a[m], self.a[i]
+            i = m
+
+    def push_many(self, xs):
+        xs = list(xs)
+        if len(xs) < len(self.a):
+            for x in xs:
+                self.push(x)
+            return
+        self.a.extend(xs)
+        for i in range(len(self.a) // 2 - 1, -1, -1):
+            self._sift_down(i)
+
     def peek(self):
+        self._prune()
         if not self.a:
             raise IndexError("peek from empty heap")
         return self.a[0]
 
+    def discard(self, x):
+        # Lazy delete: x is dropped once it surfaces at the top.
+        self._gone[x] = self._gone.get(x, 0) + 1
+        self._pending += 1
+
+    def _prune(self):
+        while self._pending and self.a and self._gone.get(self.a[0]):
+            x = self.a[0]
+            self._gone[x] -= 1
+            if not self._gone[x]:
+                del self._gone[x]
+            self._pending -= 1
+            last = self.a.pop()
+            if self.a:
+                self.a[0] = last
+                self._sift_down(0)
+
     def __len__(self):
-        return len(self.a)
+        return len(self.a) - self._pending
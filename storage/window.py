@@ -0,0 +1,78 @@
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from storage.linear import Deque
+
+
+class RollingWindow:
+    # Count/sum/min/max over the last `size` values pushed. The values sit in a
+    # FIFO Deque; min and max come from monotonic Deques of (seq, value) whose
+    # fronts are the current extremes. Every value enters and leaves each deque
+    # at most once, so push() is amortized O(1) and reads are O(1).
+    def __init__(self, size: int):
+        if size < 1:
+            raise ValueError("window size must be >= 1")
+        self.size = size
+        self.fifo = Deque()
+        self.lo = Deque()
+        self.hi = Deque()
+        self.seq = 0
+        self.total = 0
+
+    def push(self, value: int) -> None:
+        seq = self.seq
+        self.seq += 1
+        self.fifo.push_back(value)
+        self.total += value
+        if len(self.fifo) > self.size:
+            self.total -= self.fifo.pop_front()
+            expired = seq - self.size
+            if self.lo.peek_front()[0] == expired:
+                self.lo.pop_front()
+            if self.hi.peek_front()[0] == expired:
+                self.hi.pop_front()
+        while len(self.lo) and self.lo.peek_back()[1] >= value:
+            self.lo.pop_back()
+        self.lo.push_back((seq, value))
+        while len(self.hi) and self.hi.peek_back()[1] <= value:
+            self.hi.pop_back()
+        self.hi.push_back((seq, value))
+
+    def __len__(self):
+        return len(self.fifo)
+
+    def stats(self) -> Dict[str, Any]:
+        n = len(self.fifo)
+        if not n:
+            return {"count": 0, "sum": 0, "mean": None, "min": None, "max": None}
+        return {"count": n, "sum": self.total, "mean": self.total / n,
+                "min": self.lo.peek_front()[1], "max": self.hi.peek_front()[1]}
+
+
+class WindowedAggregator:
+    # One RollingWindow over the whole stream and, optionally, one per category
+    # (each over that category's last `size` values).
+    def __init__(self, size: int, per_category: bool = True):
+        self.size = size
+        self.per_category = per_category
+        self.all = RollingWindow(size)
+        self.by_category: Dict[str, RollingWindow] = {}
+
+    def add(self, category: str, value: int) -> None:
+        self.all.push(value)
+        if self.per_category:
+            w = self.by_category.get(category)
+            if w is None:
+                w = self.by_category[category] = RollingWindow(self.size)
+            w.push(value)
+
+    def extend(self, rows: Iterable[Tuple[str, int]]) -> None:
+        for category, value in rows:
+            self.add(category, value)
+
+    def stats(self, category: Optional[str] = None) -> Dict[str, Any]:
+        if category is None:
+            return self.all.stats()
+        if not self.per_category:
+            raise ValueError("per-category windows are disabled")
+        w = self.by_category.get(category)
+        return w.stats() if w else RollingWindow(1).stats()
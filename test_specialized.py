@@ -1,4 +1,5 @@
 from storage.specialized import DSU, BloomFilter, SegmentTree, Fenwick
+from storage.sketches import TopK, KLLSketch
 
 def main():
     dsu = DSU(5)
@@ -14,6 +15,8 @@ def main():
     bf.add("case")
     print("Bloom cpu:", bf.might_contain("cpu"))
     print("Bloom iphone:", bf.might_contain("iphone"))
+    bf.remove("cpu")
+    print("Bloom cpu after remove:", bf.might_contain("cpu"))
 
     a = [5, 80, 120, 7, 11]
     st = SegmentTree(a)
@@ -24,5 +27,13 @@ def main():
         fw.add(i, v)
     print("Fenwick sum(1..3):", fw.sum_range(1, 3))
 
+    top = TopK(3)
+    kll = KLLSketch(k=50, seed=0)
+    for i in range(10000):
+        top.push(i % 997, i)
+        kll.update(i)
+    print("TopK values:", [v for v, _ in top.items()])
+    print("KLL median ~5000:", abs(kll.quantile(0.5) - 5000) < 500, "retained:", kll.size)
+
 if __name__ == "__main__":
     main()
@@ -17,16 +17,31 @@ def main():
     for x in [10, 5, 15, 3, 7, 12, 11]:
         avl.insert(x)
     print("AVL inorder:", avl.inorder_list())
+    avl.delete(10)
+    print("AVL after delete 10:", avl.inorder_list())
+    avl.insert(7)
+    print("AVL with duplicate 7:", avl.inorder_list(), "rank(11):", avl.rank(11), "select(3):", avl.select(3))
+    print("AVL count_range(5, 11):", avl.count_range(5, 11), "sum_range(5, 11):", avl.sum_range(5, 11))
 
     rbt = RedBlackTree()
     for x in [10, 5, 15, 3, 7, 12, 11]:
         rbt.insert(x)
     print("RBT inorder:", rbt.inorder_list(), "search(7):", rbt.search(7))
+    rbt.delete(7)
+    print("RBT after delete 7:", rbt.inorder_list(), "search(7):", rbt.search(7))
+    print("RBT iter_range(4, 12):", list(rbt.iter_range(4, 12)), "reversed:", list(reversed(rbt)))
+    print("RBT rank(12):", rbt.rank(12), "select(0):", rbt.select(0), "count_range(4, 12):", rbt.count_range(4, 12))
+
+    bulk = RedBlackTree.from_sorted([1, 2, 2, 4, 8])
+    bulk.bulk_insert([5, 2, 9])
+    print("RBT from_sorted + bulk_insert:", bulk.inorder_list(), "count(2):", bulk.count(2))
 
     tr = Trie()
     for w in ["cpu", "case", "car", "cat", "iphone"]:
         tr.insert(w)
     print("Trie 'ca':", tr.starts_with("ca"))
+    tr.delete("car")
+    print("Trie 'ca' after delete car:", tr.starts_with("ca"))
 
 if __name__ == "__main__":
     main()